@@ -0,0 +1,306 @@
+"""
+Local stand-in for the parts of the RobotEvents API that ingestion uses.
+
+Serves, from a generated in-memory season:
+    /api/seasons/{season}/skills           season skills (one JSON array)
+    /api/v2/teams/{id}/awards              per-team awards
+    /api/v2/events                         season events (level[]=Signature filter)
+    /api/v2/events/{id}/awards             event awards
+    /api/v2/events/{id}/teams              event teams (the worlds event)
+
+v2 list endpoints are paginated like the real API (per_page/page, meta.last_page).
+Latency, 5xx errors and 429s with Retry-After can be injected to exercise the
+client's retry and rate limiting paths.
+"""
+
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+WORLDS_EVENT_ID = 58909
+
+GRADES = ("High School", "Middle School")
+QUALIFYING_TITLES = (
+    "Excellence Award",
+    "Tournament Champions",
+    "Robot Skills Champion",
+)
+OTHER_TITLES = ("Design Award", "Judges Award", "Think Award", "Build Award")
+
+
+@dataclass
+class Dataset:
+    """
+    A generated season.
+
+    Attributes:
+        season: Season id used in URLs.
+        teams: Season skills entries, ranked per grade.
+        events: Event records with id, name, level, start and awards_finalized.
+        event_awards: Event id -> awards given at that event.
+        team_awards: Team id -> awards that team won.
+        worlds_teams: Team records registered for the worlds event.
+        statuses: Team id -> expected qualification name, for checking results.
+    """
+
+    season: int
+    teams: list[dict[str, Any]] = field(default_factory=list)  # pyright: ignore[reportExplicitAny]
+    events: list[dict[str, Any]] = field(default_factory=list)  # pyright: ignore[reportExplicitAny]
+    event_awards: dict[int, list[dict[str, Any]]] = field(default_factory=dict)  # pyright: ignore[reportExplicitAny]
+    team_awards: dict[int, list[dict[str, Any]]] = field(default_factory=dict)  # pyright: ignore[reportExplicitAny]
+    worlds_teams: list[dict[str, Any]] = field(default_factory=list)  # pyright: ignore[reportExplicitAny]
+    statuses: dict[int, str] = field(default_factory=dict)
+
+
+def generate(
+    teams: int = 9200,
+    events: int = 1500,
+    signature_events: int = 20,
+    season: int = 197,
+    seed: int = 0,
+) -> Dataset:
+    """
+    Build a deterministic season.
+
+    Defaults mirror the production dump (dump.sql): ~9.2k teams of which ~18%
+    qualify for regionals and ~2% for worlds.
+    """
+    rng = random.Random(seed)
+    data = Dataset(season=season)
+    regions = [f"Region {i}" for i in range(60)]
+
+    for grade in GRADES:
+        count = teams * 7 // 10 if grade == "High School" else teams - teams * 7 // 10
+        offset = len(data.teams)
+        ranked: list[dict[str, Any]] = []  # pyright: ignore[reportExplicitAny]
+        for i in range(count):
+            team_id = offset + i + 1
+            programming = rng.randint(0, 120)
+            driver = rng.randint(0, 120)
+            ranked.append(
+                {
+                    "team": {
+                        "id": team_id,
+                        "team": f"{team_id}{'ABCDEFGHXYZ'[team_id % 11]}",
+                        "organization": f"Organization {team_id % 4000}",
+                        "country": "United States" if team_id % 5 else "Canada",
+                        "eventRegion": rng.choice(regions) if team_id % 17 else None,
+                        "gradeLevel": grade,
+                    },
+                    "scores": {
+                        "score": programming + driver,
+                        "programming": programming,
+                        "driver": driver,
+                    },
+                }
+            )
+        ranked.sort(key=lambda t: -t["scores"]["score"])  # pyright: ignore[reportAny]
+        for rank, entry in enumerate(ranked, start=1):
+            entry["rank"] = rank
+        data.teams.extend(ranked)
+
+    for i in range(events):
+        event_id = 50000 + i
+        data.events.append(
+            {
+                "id": event_id,
+                "name": f"Event {event_id}",
+                "level": "Signature" if i < signature_events else "Other",
+                "start": f"2025-{9 + i % 4:02d}-{1 + i % 28:02d}T09:00:00-04:00",
+                "awards_finalized": i < signature_events or rng.random() < 0.95,
+            }
+        )
+        data.event_awards[event_id] = []
+    signature = [e for e in data.events if e["level"] == "Signature"]
+    finalized = [
+        e for e in data.events if e["awards_finalized"] and e["level"] != "Signature"
+    ]
+    award_ids = itertools.count(1)
+
+    def award(event: dict[str, Any], title: str, team: dict[str, Any], qualifications: list[str]):  # pyright: ignore[reportExplicitAny]
+        record = {
+            "id": next(award_ids),
+            "event": {"id": event["id"], "name": event["name"]},
+            "title": title,
+            "qualifications": qualifications,
+            "teamWinners": [
+                {"team": {"id": team["id"], "name": team["team"]}, "division": None}
+            ],
+        }
+        data.event_awards[event["id"]].append(record)
+        data.team_awards.setdefault(team["id"], []).append(record)
+
+    for entry in data.teams:
+        team = entry["team"]
+        roll = rng.random()
+        if roll < 0.018:
+            data.statuses[team["id"]] = "WORLD"
+            event = rng.choice(signature if signature and rng.random() < 0.5 else finalized)
+            title = rng.choice(QUALIFYING_TITLES[:2])
+            award(event, title, team, ["World Championship"])
+            data.worlds_teams.append({"id": team["id"], "number": team["team"]})
+        elif roll < 0.2:
+            data.statuses[team["id"]] = "REGIONAL"
+            award(rng.choice(finalized), rng.choice(QUALIFYING_TITLES), team, ["Event Region Championship"])
+        else:
+            data.statuses[team["id"]] = "NONE"
+        if rng.random() < 0.3:
+            award(rng.choice(data.events), rng.choice(OTHER_TITLES), team, [])
+
+    return data
+
+
+class FakeRobotEvents:
+    """
+    Threaded HTTP server answering RobotEvents requests from a Dataset.
+
+    Args:
+        dataset: The season to serve.
+        latency: Seconds added to every response.
+        error_rate: Fraction of requests answered with a 500.
+        throttle_rate: Fraction of requests answered with a 429.
+        retry_after: Retry-After seconds sent with injected 429s.
+        seed: Seed for fault injection.
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: int = 0,
+    ):
+        self.dataset = dataset
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.counts: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._skills = {
+            grade: json.dumps(
+                [t for t in dataset.teams if t["team"]["gradeLevel"] == grade]
+            ).encode()
+            for grade in GRADES
+        }
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server is not running"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> str:
+        """Serve on an ephemeral localhost port; returns the RobotEvents base_url."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # buffer headers and body into one send; separate small writes
+            # stall on delayed ACKs and dominate the timings
+            wbufsize = 64 * 1024
+
+            def do_GET(self):
+                status, body, headers = fake.handle(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any):  # pyright: ignore[reportExplicitAny]
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-robotevents", daemon=True
+        )
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counts(self) -> Counter[int]:
+        """Return the response counts by status so far and start over."""
+        with self._lock:
+            counts = self.counts
+            self.counts = Counter()
+        return counts
+
+    def handle(self, target: str) -> tuple[int, bytes, dict[str, str]]:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            status, body, headers = 429, b'{"message": "Too Many Requests"}', {
+                "Retry-After": str(self.retry_after)
+            }
+        elif roll < self.throttle_rate + self.error_rate:
+            status, body, headers = 500, b'{"message": "Server Error"}', {}
+        else:
+            status, body = self.route(target)
+            headers = {}
+        with self._lock:
+            self.counts[status] += 1
+        return status, body, headers
+
+    def route(self, target: str) -> tuple[int, bytes]:
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = url.path.strip("/").split("/")
+        data = self.dataset
+
+        match parts:
+            case ["api", "seasons", _, "skills"]:
+                grade = query.get("grade_level", ["High School"])[0]
+                return 200, self._skills.get(grade, b"[]")
+            case ["api", "v2", "teams", team_id, "awards"]:
+                return 200, self.page(data.team_awards.get(int(team_id), []), query)
+            case ["api", "v2", "events"]:
+                events = data.events
+                if "level[]" in query:
+                    events = [e for e in events if e["level"] in query["level[]"]]
+                return 200, self.page(events, query)
+            case ["api", "v2", "events", event_id, "awards"]:
+                return 200, self.page(data.event_awards.get(int(event_id), []), query)
+            case ["api", "v2", "events", event_id, "teams"] if int(event_id) == WORLDS_EVENT_ID:
+                return 200, self.page(data.worlds_teams, query)
+            case _:
+                return 404, b'{"message": "Not Found"}'
+
+    @staticmethod
+    def page(items: list[Any], query: dict[str, list[str]]) -> bytes:  # pyright: ignore[reportExplicitAny]
+        per_page = int(query.get("per_page", ["25"])[0])
+        page = int(query.get("page", ["1"])[0])
+        last_page = max(1, -(-len(items) // per_page))
+        return json.dumps(
+            {
+                "meta": {
+                    "current_page": page,
+                    "last_page": last_page,
+                    "per_page": per_page,
+                    "total": len(items),
+                },
+                "data": items[(page - 1) * per_page : page * per_page],
+            }
+        ).encode()
@@ -0,0 +1,240 @@
+"""
+Offline ingestion benchmark against a local RobotEvents stand-in.
+
+Each scenario runs in a fresh process on its own SQLite copy so peak RSS and
+timings are not polluted by earlier scenarios:
+
+    skills        parse_skills (HS + MS) into an empty database
+    skills-warm   parse_skills again over the same data (nothing changes)
+    full          create_qualifications_full, one award request per team
+    full-sharded  the same split across --shards processes (sharding.py;
+                  db_round_trips only counts the coordinator)
+    events        create_qualifications_events, one request per event
+    sig           create_qualifications_sig + get_worlds_teams
+
+Usage (from backend/):
+    python bench/run.py
+    python bench/run.py --teams 2000 --latency 0.02 --throttle-rate 0.01 full events
+    python bench/run.py --json > before.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from fake_robotevents import FakeRobotEvents, generate
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+SCENARIOS = ("skills", "skills-warm", "full", "full-sharded", "events", "sig")
+
+
+def scenario_worker(
+    name: str,
+    base_url: str,
+    db_path: str,
+    workdir: str,
+    options: dict[str, Any],  # pyright: ignore[reportExplicitAny]
+    seed_teams: list[dict[str, Any]] | None,  # pyright: ignore[reportExplicitAny]
+    conn: Any,  # pyright: ignore[reportExplicitAny]
+):
+    """Run one scenario (or seed the template db from skills entries) in this process."""
+    import contextlib
+    import logging
+    import resource
+
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    # Read by shard processes (ingest.make_robotevents), which split the budget
+    os.environ["ROBOTEVENTS_RATE"] = str(options["rate"])
+    os.environ["ROBOTEVENTS_BURST"] = str(options["burst"])
+    sys.path.insert(0, SRC)
+    out = sys.stdout if options["verbose"] else open(os.devnull, "w")
+    if not options["verbose"]:
+        logging.getLogger("robotevents").setLevel(logging.CRITICAL)
+
+    from sqlalchemy import event
+    from sqlmodel import Session
+
+    with contextlib.redirect_stdout(out):
+        import db
+        import ingest
+        import migrations
+        import sharding
+        from progress_tracker import ProgressTracker
+        from robotevents import RobotEvents
+
+        engine = db.get_engine()
+        _ = migrations.migrate(engine)
+
+    if seed_teams is not None:
+        with Session(engine) as session:
+            _ = db.upsert_teams(session, map(RobotEvents.skills_row, seed_teams))
+        conn.send(None)
+        return
+
+    round_trips = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_round_trip(*_: Any):  # pyright: ignore[reportExplicitAny]
+        nonlocal round_trips
+        round_trips += 1
+
+    RobotEvents.rate_limiter.configure(rate=options["rate"], burst=options["burst"])
+    tracker = ProgressTracker(log_file="progress.log", quiet=True)
+    robotevents = RobotEvents("bench", progress_tracker=tracker, base_url=base_url)
+    workers: int = options["workers"]
+
+    start = time.perf_counter()
+    try:
+        with Session(engine) as session, contextlib.redirect_stdout(out):
+            if name in ("skills", "skills-warm"):
+                teams = ingest.refresh_skills(session, robotevents)
+            elif name == "full":
+                teams = robotevents.create_qualifications_full(
+                    session,
+                    db.get_all_teams(session),
+                    resume=False,
+                    progress_tracker=tracker,
+                    commit_interval=100,
+                    workers=workers,
+                )
+            elif name == "full-sharded":
+                teams = sharding.create_qualifications_sharded(
+                    session,
+                    "bench",
+                    shards=options["shards"],
+                    workers=workers,
+                    commit_interval=100,
+                    progress_tracker=tracker,
+                    base_url=base_url,
+                    poll_interval=1.0,
+                )
+            elif name == "events":
+                teams = robotevents.create_qualifications_events(
+                    session, workers=workers, progress_tracker=tracker
+                )
+            else:
+                quals = robotevents.create_qualifications_sig(workers=workers) or []
+                quals += robotevents.create_qualifications_worlds([]) or []
+                teams = db.upsert_quals_bulk(
+                    session, {q.team_id: q for q in quals}.values()
+                )
+        elapsed = time.perf_counter() - start
+    finally:
+        tracker.close()
+
+    conn.send(
+        {
+            "teams": teams,
+            "seconds": elapsed,
+            "db_round_trips": round_trips,
+            # ru_maxrss is in KiB on Linux; shard processes count as children
+            "peak_rss_mb": max(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+            )
+            / 1024,
+        }
+    )
+
+
+def run_in_process(*args: Any) -> Any:  # pyright: ignore[reportExplicitAny]
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=scenario_worker, args=(*args, child))
+    process.start()
+    child.close()
+    try:
+        result = parent.recv()
+    except EOFError:
+        result = None
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"scenario {args[0]} exited with {process.exitcode}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    _ = parser.add_argument("scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    _ = parser.add_argument("--teams", type=int, default=9200)
+    _ = parser.add_argument("--events", type=int, default=1500)
+    _ = parser.add_argument("--workers", type=int, default=8)
+    _ = parser.add_argument("--shards", type=int, default=4, help="processes for full-sharded")
+    _ = parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    _ = parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500s")
+    _ = parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429s")
+    _ = parser.add_argument("--retry-after", type=int, default=1)
+    _ = parser.add_argument("--rate", type=float, default=10000, help="client requests/sec")
+    _ = parser.add_argument("--burst", type=int, default=1000)
+    _ = parser.add_argument("--json", action="store_true", help="print results as JSON")
+    _ = parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    scenarios = args.scenarios or SCENARIOS
+
+    dataset = generate(teams=args.teams, events=args.events)
+    server = FakeRobotEvents(
+        dataset,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+    )
+    base_url = server.start()
+    options = {
+        "workers": args.workers,
+        "shards": args.shards,
+        "rate": args.rate,
+        "burst": args.burst,
+        "verbose": args.verbose,
+    }
+
+    results: dict[str, dict[str, Any]] = {}  # pyright: ignore[reportExplicitAny]
+    workdir = tempfile.mkdtemp(prefix="aiq-bench-")
+    try:
+        # Every scenario but "skills" starts from the same seeded teams table
+        template = os.path.join(workdir, "template.db")
+        run_in_process("seed", base_url, template, workdir, options, dataset.teams)
+
+        for name in scenarios:
+            db_path = os.path.join(workdir, f"{name}.db")
+            if name != "skills":
+                _ = shutil.copyfile(template, db_path)
+            _ = server.reset_counts()
+            result = run_in_process(name, base_url, db_path, workdir, options, None)
+            counts = server.reset_counts()
+            result["http_calls"] = sum(counts.values())
+            result["http_429"] = counts[429]
+            result["http_5xx"] = sum(n for status, n in counts.items() if status >= 500)
+            result["teams_per_sec"] = result["teams"] / result["seconds"] if result["seconds"] else 0
+            results[name] = result
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    columns = ("teams", "seconds", "teams_per_sec", "http_calls", "http_429", "http_5xx", "db_round_trips", "peak_rss_mb")
+    print(f"{'scenario':<12}" + "".join(f"{c:>15}" for c in columns))
+    for name, result in results.items():
+        cells = (
+            f"{result[c]:>15.2f}" if isinstance(result[c], float) else f"{result[c]:>15}"
+            for c in columns
+        )
+        print(f"{name:<12}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
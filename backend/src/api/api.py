@@ -1,144 +1,267 @@
-from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Query, status
-from sqlalchemy.orm import query
-from sqlmodel import Session, select
-from typing import Annotated
+from contextlib import asynccontextmanager
+import os
+import time
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+from typing import Annotated, Literal
 
-from api import auth
+from api import async_api, auth
+from api.cache import data_etag, read_cache, version_etag
+from api.responses import (
+    NDJSON_MEDIA_TYPE,
+    QUALIFICATIONS_VARY,
+    EncodedBody,
+    encoded_response,
+    etag_matches,
+    qualification_ndjson,
+    wants_ndjson,
+)
+from api.models import leaderboard_rows, qualification_rows
+import config
 import db
-from tables import Qualification, Qualifications, Teams
+import ingest
+import metrics
+import queries
+import region_stats
+import sql_profiler
+from scheduler import Scheduler
+from tables import Qualification, Qualifications
 
-from pydantic import BaseModel
 
+from fastapi.middleware.cors import CORSMiddleware
 
-class LeaderboardEntry(BaseModel):
-    number: str
-    status: Qualification
-    organization: str
-    country: str
-    region: str
-    world_rank: int
-    score: int
-    driver: int
-    programming: int
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Per-worker startup: nothing connects before this, and only lazily after
+    if os.environ.get("DB_MIGRATE_ON_STARTUP") == "1":
+        import migrations
 
-class TeamQualificationOut(BaseModel):
-    number: str
-    organization: str
-    status: Qualification
+        _ = migrations.migrate(db.get_engine())
 
+    # SCHEDULER_ENABLED=1 runs the skills/qualifications refreshes in-process
+    token = os.environ.get("ROBOTEVENTS_AUTH_TOKEN")
+    scheduler: Scheduler | None = None
+    if os.environ.get("SCHEDULER_ENABLED") == "1":
+        if token:
+            scheduler = ingest.create_scheduler(token)
+            scheduler.start()
+        else:
+            print("SCHEDULER_ENABLED is set but ROBOTEVENTS_AUTH_TOKEN is missing")
+    app.state.scheduler = scheduler
+    yield
+    if scheduler is not None:
+        scheduler.stop()
+    await db.dispose_engines()
 
-from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        with sql_profiler.profile(f"{request.method} {request.url.path}", top=5):
+            response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # route templates (/jobs/{name}) keep the label set bounded
+        route = request.scope.get("route")
+        metrics.http_request_seconds.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=status_code,
+        )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
+# Endpoints that are the same whether or not DB_ASYNC is set
+service_router = APIRouter()
 
-@app.get("/teams")
+
+@service_router.get("/metrics")
+def get_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# DB-backed endpoints; api.async_api has async twins used when DB_ASYNC=1
+router = APIRouter()
+
+
+@router.get("/teams")
 def get_teams(
     session: Session = Depends(db.get_session), _=Depends(auth.authenticate_user)
 ):
     print("getting ateams ts")
     return {"code": 200, "result": db.get_all_teams(session)}
 
-@app.get("/regions")
-def get_regions(session: Session = Depends(db.get_session)):
-    query = select(Teams.region).distinct().order_by(Teams.region)
-    rows = session.exec(query).all()
-    return rows
+@router.get("/regions")
+def get_regions(request: Request, session: Session = Depends(db.get_session)):
+    def compute():
+        return EncodedBody.encode(session.exec(queries.regions()).all())
 
+    body, version = read_cache.get_or_compute(("regions",), compute)
+    return encoded_response(request, body, version_etag(version))
 
-@app.get("/lb")
+
+@router.get("/lb")
 def get_leaderboard(
+    request: Request,
     grade: str = "High School",
     region: str | None = None,
     exclude_statuses: Annotated[list[Qualification], Query()] = [Qualification.NONE],
     limit: int = 20,
     session: Session = Depends(db.get_session),
 ):
-    query = (
-        select(
-            Teams.number,
-            Qualifications.status,
-            Teams.organization,
-            Teams.country,
-            Teams.region,
-            Teams.world_rank,
-            Teams.score,
-            Teams.driver,
-            Teams.programming,
-        )
-        .join(Qualifications)
-        .where(Teams.grade == grade)
-        .order_by(Teams.world_rank)
-        .limit(limit)
+    key = ("lb", grade, region, tuple(sorted(set(exclude_statuses))), limit)
+    body, version = read_cache.get_or_compute(
+        key, lambda: _leaderboard(session, grade, region, exclude_statuses, limit)
     )
+    return encoded_response(request, body, version_etag(version))
 
-    for excluded_status in exclude_statuses:
-        query = query.where(Qualifications.status != excluded_status)
-    
-    if region is not None:
-        query = query.where(Teams.region == region)
 
+def _leaderboard(
+    session: Session,
+    grade: str,
+    region: str | None,
+    exclude_statuses: list[Qualification],
+    limit: int,
+):
+    query = queries.leaderboard(grade, region, exclude_statuses, limit)
     rows = session.exec(query).all()
 
-    result = [
-        LeaderboardEntry(
-            number=number,
-            status=qual_status, 
-            organization=organization,
-            country=country,
-            region=reg,
-            world_rank=world_rank,
-            score=score,
-            driver=driver,
-            programming=programming,
+    return EncodedBody.encode({"code": 200, "result": leaderboard_rows(rows)})
+
+
+@router.get("/qualifications")
+def get_qualifications(
+    request: Request,
+    after: int | None = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    format: str | None = None,
+    session: Session = Depends(db.get_session),
+):
+    """
+    All team qualifications, ordered by team id.
+
+    Pass `limit` (and `after`, the X-Next-Cursor of the previous page) to page
+    through the rows, or ask for NDJSON (?format=ndjson or Accept:
+    application/x-ndjson) to stream them as they come off the cursor.
+    Responses carry an ETag tied to the data version and the representation
+    (JSON or NDJSON); If-None-Match gets a 304.
+    """
+    ndjson = wants_ndjson(request, format)
+    etag = data_etag("ndjson" if ndjson else None)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Vary": QUALIFICATIONS_VARY},
         )
-        for number, qual_status, organization, country, reg, world_rank, score, driver, programming in rows
-    ]
 
-    return {"code": 200, "result": result}
+    stmt = queries.qualifications(after, limit)
+    if ndjson:
+        def stream():
+            # the request's session may be closed before the body is streamed
+            with Session(db.get_engine()) as stream_session:
+                for row in stream_session.exec(stmt.execution_options(yield_per=1000)):
+                    yield qualification_ndjson(row)
 
+        return StreamingResponse(
+            stream(),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"ETag": etag, "Vary": QUALIFICATIONS_VARY},
+        )
 
-@app.get("/qualifications")
-def get_qualifications(
-        session: Session = Depends(db.get_session)):
-    stmt = select(
-        Teams.number,
-        Teams.organization,
-        Qualifications.status,
-    ).join(Qualifications)
-
-    rows = session.exec(stmt).all()
-
-    return [
-        TeamQualificationOut(
-            number=number,
-            organization=organization,
-            status=status,  # pyright: ignore[reportArgumentType]
+    def compute():
+        rows = session.exec(stmt).all()
+        headers = {}
+        if limit is not None and len(rows) == limit:
+            headers["X-Next-Cursor"] = str(rows[-1][0])
+        return EncodedBody.encode(qualification_rows(rows), headers)
+
+    body, version = read_cache.get_or_compute(("qualifications", after, limit), compute)
+    return encoded_response(request, body, version_etag(version), vary=QUALIFICATIONS_VARY)
+
+@router.get("/stats")
+def get_region_stats(
+    request: Request,
+    grade: str | None = None,
+    by: Literal["region", "country"] = "region",
+    session: Session = Depends(db.get_session),
+):
+    """
+    Per-region (or per-country) RegionStatsEntry list: teams by qualification,
+    score mean and percentiles, and the top score, driver and programming teams.
+
+    Served from the region_stats summary tables that ingestion and
+    PUT /qualifications keep current, so the cost grows with regions, not teams.
+    """
+    def compute():
+        stats = session.exec(queries.region_stats(grade)).all()
+        buckets = session.exec(queries.region_score_buckets(grade)).all()
+        return EncodedBody.encode(
+            {"code": 200, "result": region_stats.summarize(stats, buckets, by)}
         )
-        for number, organization, status in rows
-    ]
 
-@app.get("/lastSlow")
+    body, version = read_cache.get_or_compute(("stats", grade, by), compute)
+    return encoded_response(request, body, version_etag(version))
+
+@service_router.get("/lastSlow")
 def get_last_slow(
     session: Session = Depends(db.get_session),
     _ = Depends(auth.authenticate_user)):
     return db.get_last_slow_update(session)
 
-# @app.post("/update")
-# def trigger_update(
-#     session: Session = Depends(db.get_session),
-#         _ = Depends(auth.authenticate_user)):
-#     pass
+def get_scheduler(request: Request) -> Scheduler:
+    scheduler: Scheduler | None = request.app.state.scheduler
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="scheduler is not enabled")
+    return scheduler
 
-@app.put("/qualifications")
+
+@service_router.get("/jobs")
+def get_jobs(
+    scheduler: Scheduler = Depends(get_scheduler),
+    _=Depends(auth.authenticate_user),
+):
+    return {
+        name: {
+            "next_run": job.next_run,
+            "last_run": job.last_run.to_dict() if job.last_run else None,
+        }
+        for name, job in scheduler.jobs.items()
+    }
+
+
+@service_router.get("/jobs/{name}")
+def get_job(
+    name: str,
+    scheduler: Scheduler = Depends(get_scheduler),
+    _=Depends(auth.authenticate_user),
+):
+    job = scheduler.jobs.get(name)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"unknown job {name}")
+    return {
+        "next_run": job.next_run,
+        "history": [run.to_dict() for run in reversed(job.history)],
+    }
+
+
+@service_router.post("/jobs/{name}", status_code=202)
+def trigger_job(
+    name: str,
+    response: Response,
+    scheduler: Scheduler = Depends(get_scheduler),
+    _=Depends(auth.authenticate_user),
+):
+    if name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail=f"unknown job {name}")
+    run, started = scheduler.trigger(name)
+    if not started:
+        response.status_code = status.HTTP_409_CONFLICT
+    return run.to_dict()
+
+@router.put("/qualifications")
 def put_qualifications(
     team: str,
     status: Qualification,
@@ -154,6 +277,33 @@ def put_qualifications(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/")
+
+@service_router.get("/")
 async def root():
     return {"message": "Hello World"}
+
+
+def create_app() -> FastAPI:
+    """
+    Build the API app; run with `uvicorn --factory api.api:create_app` or
+    `python cli.py serve`.
+
+    Reads .env and picks the sync or async (DB_ASYNC=1) handlers, but opens no
+    connections: engines are created on first use and scheduler startup and
+    optional migrations (DB_MIGRATE_ON_STARTUP=1) happen in the lifespan.
+    """
+    config.load_env()
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # readable by browser clients paging /qualifications or revalidating
+        expose_headers=["X-Next-Cursor", "ETag"],
+    )
+    _ = app.middleware("http")(record_request_metrics)
+    app.include_router(async_api.router if db.async_enabled() else router)
+    app.include_router(service_router)
+    return app
@@ -0,0 +1,141 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated, Literal
+
+from api import auth
+from api.cache import data_etag_async, read_cache, version_etag
+from api.responses import (
+    NDJSON_MEDIA_TYPE,
+    QUALIFICATIONS_VARY,
+    EncodedBody,
+    encoded_response,
+    etag_matches,
+    qualification_ndjson,
+    wants_ndjson,
+)
+from api.models import leaderboard_rows, qualification_rows
+import db
+import queries
+import region_stats
+from tables import Qualification, Qualifications
+
+# Async versions of the DB-backed endpoints in api.api, served when DB_ASYNC=1.
+# Handlers await the database instead of holding a threadpool thread per request.
+router = APIRouter()
+
+
+@router.get("/teams")
+async def get_teams(
+    session: AsyncSession = Depends(db.get_async_session),
+    _=Depends(auth.authenticate_user_async),
+):
+    return {"code": 200, "result": await db.get_all_teams_async(session)}
+
+
+@router.get("/regions")
+async def get_regions(
+    request: Request, session: AsyncSession = Depends(db.get_async_session)
+):
+    async def compute():
+        return EncodedBody.encode((await session.exec(queries.regions())).all())
+
+    body, version = await read_cache.get_or_compute_async(("regions",), compute)
+    return encoded_response(request, body, version_etag(version))
+
+
+@router.get("/lb")
+async def get_leaderboard(
+    request: Request,
+    grade: str = "High School",
+    region: str | None = None,
+    exclude_statuses: Annotated[list[Qualification], Query()] = [Qualification.NONE],
+    limit: int = 20,
+    session: AsyncSession = Depends(db.get_async_session),
+):
+    async def compute():
+        query = queries.leaderboard(grade, region, exclude_statuses, limit)
+        rows = (await session.exec(query)).all()
+        return EncodedBody.encode({"code": 200, "result": leaderboard_rows(rows)})
+
+    key = ("lb", grade, region, tuple(sorted(set(exclude_statuses))), limit)
+    body, version = await read_cache.get_or_compute_async(key, compute)
+    return encoded_response(request, body, version_etag(version))
+
+
+@router.get("/qualifications")
+async def get_qualifications(
+    request: Request,
+    after: int | None = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    format: str | None = None,
+    session: AsyncSession = Depends(db.get_async_session),
+):
+    ndjson = wants_ndjson(request, format)
+    etag = await data_etag_async("ndjson" if ndjson else None)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Vary": QUALIFICATIONS_VARY},
+        )
+
+    stmt = queries.qualifications(after, limit)
+    if ndjson:
+        async def stream():
+            async with AsyncSession(db.get_async_engine()) as stream_session:
+                result = await stream_session.stream(stmt)
+                async for row in result:
+                    yield qualification_ndjson(row)
+
+        return StreamingResponse(
+            stream(),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"ETag": etag, "Vary": QUALIFICATIONS_VARY},
+        )
+
+    async def compute():
+        rows = (await session.exec(stmt)).all()
+        headers = {}
+        if limit is not None and len(rows) == limit:
+            headers["X-Next-Cursor"] = str(rows[-1][0])
+        return EncodedBody.encode(qualification_rows(rows), headers)
+
+    body, version = await read_cache.get_or_compute_async(
+        ("qualifications", after, limit), compute
+    )
+    return encoded_response(request, body, version_etag(version), vary=QUALIFICATIONS_VARY)
+
+
+@router.get("/stats")
+async def get_region_stats(
+    request: Request,
+    grade: str | None = None,
+    by: Literal["region", "country"] = "region",
+    session: AsyncSession = Depends(db.get_async_session),
+):
+    async def compute():
+        stats = (await session.exec(queries.region_stats(grade))).all()
+        buckets = (await session.exec(queries.region_score_buckets(grade))).all()
+        return EncodedBody.encode(
+            {"code": 200, "result": region_stats.summarize(stats, buckets, by)}
+        )
+
+    body, version = await read_cache.get_or_compute_async(("stats", grade, by), compute)
+    return encoded_response(request, body, version_etag(version))
+
+
+@router.put("/qualifications")
+async def put_qualifications(
+    team: str,
+    status: Qualification,
+    session: AsyncSession = Depends(db.get_async_session),
+    _=Depends(auth.authenticate_user_async),
+):
+    try:
+        team_id = await db.number_to_id_async(session, team)
+        await db.update_quals_async(
+            session, Qualifications(team_id=team_id, status=status)
+        )
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,14 +1,17 @@
 import base64
+from collections import OrderedDict
 from dataclasses import dataclass
 import os
+import threading
+import time
 from typing import TypedDict, cast
-from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 from fastapi import Depends, HTTPException, Header, status
+from fastapi.concurrency import run_in_threadpool
 import jwt
-from dotenv import load_dotenv
 import requests
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 import db
 
 
@@ -34,10 +37,6 @@ class JwtClaim(TypedDict):
     aud: str
 
 
-if not load_dotenv():
-    print("loading .env failed")
-
-
 def base64url_decode(s: str):
     rem = len(s) % 4
     if rem > 0:
@@ -45,36 +44,124 @@ def base64url_decode(s: str):
     return base64.urlsafe_b64decode(s)
 
 
+class JwksCache:
+    """
+    Public keys from better-auth's JWKS endpoint, indexed by kid.
+
+    Keys are refetched only when the TTL has expired or a token names a kid
+    we haven't seen (at most once per `min_refresh` seconds, so junk kids
+    can't hammer the endpoint). Concurrent refreshes are coalesced: threads
+    that waited on the lock reuse the result of the refresh they waited for.
+    """
+
+    def __init__(self, ttl: float = 3600, min_refresh: float = 30):
+        self.ttl = ttl
+        self.min_refresh = min_refresh
+        self._keys: dict[str, Ed25519PublicKey] = {}
+        self._fetched_at = float("-inf")
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return time.monotonic() - self._fetched_at < self.ttl
+
+    def _lookup(self, kid: str | None) -> Ed25519PublicKey | None:
+        if kid is None:
+            # tokens without a kid are only unambiguous with a single key
+            return next(iter(self._keys.values())) if len(self._keys) == 1 else None
+        return self._keys.get(kid)
+
+    def _refresh(self):
+        jwks_endpoint = f"{os.environ['BETTER_AUTH_URL']}/api/auth/jwks"
+        res = requests.get(jwks_endpoint, timeout=5)
+        res.raise_for_status()
+        keys: dict[str, Ed25519PublicKey] = {}
+        for jwk in cast(list[Jwk], res.json()["keys"]):
+            if jwk["kty"] != "OKP" or jwk["crv"] != "Ed25519":
+                continue
+            keys[jwk["kid"]] = Ed25519PublicKey.from_public_bytes(
+                base64url_decode(jwk["x"])
+            )
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self._generation += 1
+
+    def get(self, kid: str | None) -> Ed25519PublicKey | None:
+        key = self._lookup(kid)
+        if key is not None and self._fresh():
+            return key
+        if key is None and time.monotonic() - self._fetched_at < self.min_refresh:
+            return None
+
+        generation = self._generation
+        with self._lock:
+            if self._generation == generation:
+                self._refresh()
+        return self._lookup(kid)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of decoded tokens; entries are dropped once the token's exp passes."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, JwtClaim] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> JwtClaim | None:
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is None:
+                return None
+            if payload["exp"] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: JwtClaim):
+        with self._lock:
+            self._entries[token] = payload
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                _ = self._entries.popitem(last=False)
+
+
+jwks_cache = JwksCache()
+verified_tokens = VerifiedTokenCache()
+
+
+def decode_token(token: str) -> JwtClaim | None:
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
+
+    try:
+        kid = cast(str | None, jwt.get_unverified_header(token).get("kid"))
+        key = jwks_cache.get(kid)
+        if key is None:
+            return None
+        payload = cast(
+            JwtClaim,
+            jwt.decode(
+                token,
+                key,
+                audience=os.environ["BETTER_AUTH_URL"],
+                algorithms=["EdDSA"],
+                # verified_tokens expires entries by exp
+                options={"require": ["exp"]},
+            ),
+        )
+    except (jwt.InvalidTokenError, requests.RequestException) as e:
+        print(f"rejecting token: {e}")
+        return None
+
+    verified_tokens.put(token, payload)
+    return payload
+
+
 def auth_jwt(session: Session, token: str) -> bool:
-    jwks_endpoint = f"{os.environ['BETTER_AUTH_URL']}/api/auth/jwks"
-    jwks = requests.get(jwks_endpoint)
-    if not jwks:
-        return False
-    keys = cast(list[Jwk], jwks.json()["keys"])
-
-    # docs didn't really say if there could be more than one keys so ill handle it when i see it
-    # FIGURE this out before pushing to prod
-    if len(keys) != 1:
-        print("expected length of keys to be 1!!")
-    assert len(keys) == 1
-
-    key: str = keys[0]["x"]
-    public_key_bytes = base64url_decode(key)
-    public_key_obj = Ed25519PublicKey.from_public_bytes(public_key_bytes)
-    public_key_pem = public_key_obj.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo,
-    ).decode("utf-8")
-
-    payload = cast(
-        JwtClaim,
-        jwt.decode(
-            token,
-            public_key_pem,
-            audience=os.environ["BETTER_AUTH_URL"],
-            algorithms=["EdDSA"],
-        ),
-    )
+    payload = decode_token(token)
 
     if not payload:
         return False
@@ -87,16 +174,46 @@ def auth_jwt(session: Session, token: str) -> bool:
     return bool(valid)
 
 
+async def auth_jwt_async(session: AsyncSession, token: str) -> bool:
+    # a miss may refetch the JWKS with a blocking HTTP call, so it runs off the loop
+    payload = verified_tokens.get(token) or await run_in_threadpool(decode_token, token)
+
+    if not payload:
+        return False
+
+    valid = 0b1
+
+    valid |= await db.user_has_perms_async(session, payload["id"])
+    valid |= payload["iss"] == os.environ["BETTER_AUTH_URL"]
+
+    return bool(valid)
+
+
+def bearer_token(authorization: str | None) -> str:
+    if not authorization:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="No Authorization header"
+        )
+    _, _, token = authorization.partition(" ")
+    return token
+
+
 def authenticate_user(
     session: Session = Depends(db.get_session),
     authorization: str | None = Header(),
 ):
-    if not authorization:
+    if not auth_jwt(session, bearer_token(authorization)):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="No Authorization header"
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized"
         )
-    _, _, token = authorization.partition(" ")
-    if not auth_jwt(session, token):
+
+
+async def authenticate_user_async(
+    session: AsyncSession = Depends(db.get_async_session),
+    authorization: str | None = Header(),
+):
+    """authenticate_user for api.async_api: no sync session or blocking call on the loop."""
+    if not await auth_jwt_async(session, bearer_token(authorization)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized"
         )
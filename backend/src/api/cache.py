@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from api.responses import EncodedBody
+import db
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class VersionedCache(Generic[V]):
+    """
+    Bounded LRU cache whose entries expire when db's data version changes.
+
+    Every entry remembers the data version it was computed at; a lookup made
+    after any write path has bumped the version is treated as a miss. The
+    version is shared through the database, so writes from other processes
+    expire entries too, within db.DATA_VERSION_TTL seconds.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[int, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable, version: int) -> V | object:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return _MISSING
+
+    def _store(self, key: Hashable, version: int, value: V):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                _ = self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], V]
+    ) -> tuple[V, int]:
+        """
+        Cached value for key, computing and storing it on a miss.
+
+        Returns:
+            The value and the data version it was computed at; build ETags
+            from that version rather than re-reading the current one, which a
+            write may have bumped in the meantime
+        """
+        version = db.get_data_version()
+        value = self._lookup(key, version)
+        if value is _MISSING:
+            value = compute()
+            self._store(key, version, value)
+        return value, version  # pyright: ignore[reportReturnType]
+
+    async def get_or_compute_async(
+        self, key: Hashable, compute: Callable[[], Awaitable[V]]
+    ) -> tuple[V, int]:
+        version = await db.get_data_version_async()
+        value = self._lookup(key, version)
+        if value is _MISSING:
+            value = await compute()
+            self._store(key, version, value)
+        return value, version  # pyright: ignore[reportReturnType]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Read endpoints only change on ingestion or PUT /qualifications
+read_cache: VersionedCache[EncodedBody] = VersionedCache(maxsize=512)
+
+
+def version_etag(version: int, variant: str | None = None) -> str:
+    """
+    Weak ETag for a response computed at the given data version.
+
+    Args:
+        version: Data version the body was built from
+        variant: Representation of the resource (e.g. "ndjson") when one URL
+            serves several; each gets its own tag
+    """
+    return f'W/"{version}-{variant}"' if variant else f'W/"{version}"'
+
+
+def data_etag(variant: str | None = None) -> str:
+    """Weak ETag for the current data version; see version_etag."""
+    return version_etag(db.get_data_version(), variant)
+
+
+async def data_etag_async(variant: str | None = None) -> str:
+    return version_etag(await db.get_data_version_async(), variant)
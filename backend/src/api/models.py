@@ -0,0 +1,64 @@
+from collections.abc import Iterable
+from typing import Any
+
+from pydantic import BaseModel
+
+from tables import Qualification
+
+
+class LeaderboardEntry(BaseModel):
+    number: str
+    status: Qualification
+    organization: str
+    country: str
+    region: str
+    world_rank: int
+    score: int
+    driver: int
+    programming: int
+
+class TeamQualificationOut(BaseModel):
+    number: str
+    organization: str
+    status: Qualification
+
+
+class TopTeam(BaseModel):
+    number: str | None
+    value: int
+
+class ScoreSummary(BaseModel):
+    mean: float
+    # approximate, interpolated within region_stats.SCORE_BUCKET_WIDTH
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+    max: int
+
+class RegionStatsEntry(BaseModel):
+    grade: str
+    region: str | None = None  # omitted when grouped by country
+    country: str
+    teams: int
+    qualifications: dict[str, int]  # Qualification name -> teams
+    score: ScoreSummary
+    top: dict[str, TopTeam]  # score / driver / programming
+
+
+# Rows are turned straight into dicts for the encoded-body cache; the models
+# above document the response shapes.
+LEADERBOARD_FIELDS = tuple(LeaderboardEntry.model_fields)
+
+
+def leaderboard_rows(rows: Iterable[Any]) -> list[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+    """queries.leaderboard() rows as LeaderboardEntry-shaped dicts."""
+    return [dict(zip(LEADERBOARD_FIELDS, row)) for row in rows]
+
+
+def qualification_rows(rows: Iterable[Any]) -> list[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+    """queries.qualifications() rows as TeamQualificationOut-shaped dicts."""
+    return [
+        {"number": number, "organization": organization, "status": status}
+        for _, number, organization, status in rows
+    ]
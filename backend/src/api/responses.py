@@ -0,0 +1,123 @@
+import gzip
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import Request, Response
+
+# Optional speedups (`pip install .[fast]`); the stdlib is used without them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Bodies smaller than this go out uncompressed
+MIN_COMPRESS_SIZE = 512
+
+
+def dumps(obj: Any) -> bytes:  # pyright: ignore[reportExplicitAny]
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """
+    A JSON body serialized once, with its compressed variants.
+
+    Stored in read_cache, so it is rebuilt only when the data version changes
+    and every request in between just picks the variant the client accepts.
+
+    Attributes:
+        identity: The uncompressed JSON bytes.
+        gzip: gzip variant, or None for small bodies.
+        br: brotli variant, or None for small bodies or without brotli installed.
+        headers: Extra headers sent with the body, e.g. a pagination cursor.
+    """
+
+    identity: bytes
+    gzip: bytes | None = None
+    br: bytes | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def encode(cls, obj: Any, headers: dict[str, str] | None = None) -> "EncodedBody":  # pyright: ignore[reportExplicitAny]
+        identity = dumps(obj)
+        gzipped = br = None
+        if len(identity) >= MIN_COMPRESS_SIZE:
+            gzipped = gzip.compress(identity, compresslevel=6, mtime=0)
+            if brotli is not None:
+                br = brotli.compress(identity, quality=6)
+        return cls(identity, gzipped, br, headers or {})
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codings from an Accept-Encoding header, minus any refused with q=0."""
+    accepted: set[str] = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def encoded_response(
+    request: Request,
+    body: EncodedBody,
+    etag: str,
+    vary: str = "Accept-Encoding",
+) -> Response:
+    """Send the smallest variant of `body` the client accepts, or a 304."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": vary})
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    headers = {"ETag": etag, "Vary": vary, **body.headers}
+    content = body.identity
+    if body.br is not None and "br" in accepted:
+        content = body.br
+        headers["Content-Encoding"] = "br"
+    elif body.gzip is not None and ("gzip" in accepted or "*" in accepted):
+        content = body.gzip
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+# /qualifications picks JSON or NDJSON from the Accept header
+QUALIFICATIONS_VARY = "Accept, Accept-Encoding"
+
+
+def wants_ndjson(request: Request, format: str | None) -> bool:
+    """NDJSON if asked for with ?format=ndjson or an Accept header."""
+    if format is not None:
+        return format == "ndjson"
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def qualification_ndjson(row: Any) -> bytes:  # pyright: ignore[reportExplicitAny]
+    """One NDJSON line for a queries.qualifications() row, same fields as TeamQualificationOut."""
+    _, number, organization, status = row
+    return dumps(
+        {"number": number, "organization": organization, "status": int(status)}
+    ) + b"\n"
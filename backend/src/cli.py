@@ -0,0 +1,131 @@
+"""
+Command line entry points, kept separate from the API app.
+
+Usage:
+    python cli.py serve [--host H] [--port P] [--workers N]
+    python cli.py ingest [--skills] [--force]
+    python cli.py migrate [--check] [--rebuild-stats]
+
+`serve` runs api.api:create_app under uvicorn; each worker builds its own app
+and connects lazily. `ingest` and `migrate` may prompt for missing secrets.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+import config
+
+
+def _robotevents_token() -> str:
+    # Get RobotEvents token - from environment or stdin
+    robotevents_token = os.environ.get("ROBOTEVENTS_AUTH_TOKEN")
+    if not robotevents_token:
+        print("\nROBOTEVENTS_AUTH_TOKEN not found in environment.")
+        print("Please enter your RobotEvents API token:")
+        try:
+            robotevents_token = input("> ").strip()
+            if not robotevents_token:
+                print("Error: Token cannot be empty")
+                sys.exit(1)
+        except (EOFError, KeyboardInterrupt):
+            print("\nError: Token input cancelled")
+            sys.exit(1)
+    return robotevents_token
+
+
+def ingest(args: argparse.Namespace) -> int:
+    """Refresh skills (--skills) and, when a week old (or --force), qualifications."""
+    from sqlmodel import Session
+
+    import db
+    import ingest
+    import migrations
+
+    token = _robotevents_token()
+    engine = db.get_engine(interactive=True)
+    _ = migrations.migrate(engine)
+
+    # Create progress tracker for the long-running qualification creation
+    progress_tracker = ingest.make_progress_tracker()
+    try:
+        # Initialize RobotEvents with progress tracker for API request logging
+        robotevents = ingest.make_robotevents(token, progress_tracker)
+        with Session(engine) as session:
+            if args.skills:
+                _ = ingest.refresh_skills(session, robotevents)
+
+            last_update = db.get_last_slow_update(session)
+            if args.force or datetime.now() - last_update > timedelta(days=7):
+                print("last update was: ", last_update)
+                _ = ingest.refresh_qualifications(session, robotevents, progress_tracker)
+    finally:
+        progress_tracker.close()
+    return 0
+
+
+def migrate(args: argparse.Namespace) -> int:
+    import db
+    import migrations
+
+    engine = db.get_engine(interactive=True)
+    if args.check:
+        failed = False
+        for name, (expected, used) in migrations.check_indexes(engine).items():
+            if used is None:
+                print(f"SKIP {name}: expected {expected}, no index check for {engine.dialect.name}")
+                continue
+            ok = expected in used
+            failed |= not ok
+            print(f"{'OK  ' if ok else 'MISS'} {name}: expected {expected}, used {sorted(used) or 'none'}")
+        return 1 if failed else 0
+    applied = migrations.migrate(engine)
+    print(f"{len(applied)} migrations applied")
+    if args.rebuild_stats:
+        with engine.begin() as conn:
+            regions = db.rebuild_region_stats(conn)
+        print(f"rebuilt region stats for {regions} (grade, region) pairs")
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    import uvicorn
+
+    uvicorn.run(
+        "api.api:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="cli.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the API")
+    _ = serve_parser.add_argument("--host", default="127.0.0.1")
+    _ = serve_parser.add_argument("--port", type=int, default=8000)
+    _ = serve_parser.add_argument("--workers", type=int, default=1)
+    serve_parser.set_defaults(func=serve)
+
+    ingest_parser = commands.add_parser("ingest", help="refresh skills and qualifications")
+    _ = ingest_parser.add_argument("--skills", action="store_true", help="refresh season skills first")
+    _ = ingest_parser.add_argument("--force", action="store_true", help="refresh qualifications even if recent")
+    ingest_parser.set_defaults(func=ingest)
+
+    migrate_parser = commands.add_parser("migrate", help="apply schema migrations")
+    _ = migrate_parser.add_argument("--check", action="store_true", help="verify the read queries use the indexes")
+    _ = migrate_parser.add_argument("--rebuild-stats", action="store_true", help="recompute the /stats region aggregates from teams")
+    migrate_parser.set_defaults(func=migrate)
+
+    args = parser.parse_args(argv)
+    config.load_env()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import threading
+
+from dotenv import load_dotenv
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env():
+    """
+    Load .env into the environment, once per process.
+
+    Called by the entry points (cli.py, api.api.create_app) instead of at
+    import time, so importing modules never touches the filesystem.
+    """
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        _loaded = True
+        if not load_dotenv():
+            print("Warning: .env file not found or failed to load")
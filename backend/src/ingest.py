@@ -0,0 +1,208 @@
+"""
+Ingestion steps shared by `cli.py ingest` and the API's background scheduler.
+
+Configuration comes from the environment:
+    ROBOTEVENTS_RATE / ROBOTEVENTS_BURST   shared request budget
+    ROBOTEVENTS_CACHE_DIR / _CACHE_TTL     optional on-disk response cache
+    ROBOTEVENTS_RECORD / _REPLAY           record responses to / replay from an archive file
+    ROBOTEVENTS_WORKERS                    concurrent requests per job
+    QUALIFICATION_STRATEGY                 teams | events | incremental
+    QUALIFICATION_SHARDS                   worker processes for the teams strategy
+    PROGRESS_QUIET / PROGRESS_JSON         progress log output
+    SQL_PROFILE / SQL_PROFILE_N_PLUS_ONE   statement report per run, N+1 threshold
+    SKILLS_REFRESH_MINUTES                 scheduler cadence for skills
+    QUALIFICATIONS_REFRESH_DAYS            scheduler cadence for qualifications
+"""
+
+import functools
+import os
+from datetime import timedelta
+from typing import Literal
+
+from sqlmodel import Session
+
+import db
+from progress_tracker import ProgressTracker
+from response_archive import ResponseArchive
+from response_cache import ResponseCache
+from robotevents import ROBOTEVENTS_URL, RobotEvents
+from scheduler import Scheduler
+import sharding
+import sql_profiler
+
+
+def make_progress_tracker() -> ProgressTracker:
+    return ProgressTracker(
+        log_file="qualification_progress.log",
+        quiet=os.environ.get("PROGRESS_QUIET") == "1",
+        json_lines=os.environ.get("PROGRESS_JSON") == "1",
+    )
+
+
+@functools.cache
+def response_archive(path: str, mode: Literal["record", "replay"]) -> ResponseArchive:
+    # One archive per process, shared by every RobotEvents (and scheduler run)
+    return ResponseArchive(path, mode=mode)
+
+
+def make_robotevents(
+    token: str,
+    progress_tracker: ProgressTracker | None = None,
+    processes: int = 1,
+    base_url: str | None = None,
+) -> RobotEvents:
+    # Process-wide request budget shared by all RobotEvents workers, split
+    # evenly when `processes` shard processes run at once (sharding.py)
+    RobotEvents.rate_limiter.configure(
+        rate=float(os.environ.get("ROBOTEVENTS_RATE", "5")) / processes,
+        burst=max(1, int(os.environ.get("ROBOTEVENTS_BURST", "10")) // processes),
+    )
+
+    # Optional on-disk response cache so interrupted or re-run jobs are mostly served locally
+    cache_dir = os.environ.get("ROBOTEVENTS_CACHE_DIR")
+
+    # Record a run to a single archive file, or replay one without any network I/O
+    archive = None
+    if record := os.environ.get("ROBOTEVENTS_RECORD"):
+        archive = response_archive(record, "record")
+    elif replay := os.environ.get("ROBOTEVENTS_REPLAY"):
+        archive = response_archive(replay, "replay")
+
+    return RobotEvents(
+        token,
+        progress_tracker=progress_tracker,
+        cache=ResponseCache(
+            cache_dir, ttl=float(os.environ.get("ROBOTEVENTS_CACHE_TTL", "86400"))
+        )
+        if cache_dir
+        else None,
+        archive=archive,
+        base_url=base_url or ROBOTEVENTS_URL,
+    )
+
+
+def refresh_qualifications(
+    session: Session, robotevents: RobotEvents, progress_tracker: ProgressTracker
+) -> int:
+    """Run the configured qualification strategy and record the update time."""
+    with sql_profiler.profile("refresh_qualifications"):
+        return _refresh_qualifications(session, robotevents, progress_tracker)
+
+
+def _refresh_qualifications(
+    session: Session, robotevents: RobotEvents, progress_tracker: ProgressTracker
+) -> int:
+    workers = int(os.environ.get("ROBOTEVENTS_WORKERS", "8"))
+    strategy = os.environ.get("QUALIFICATION_STRATEGY", "teams")
+    if strategy == "incremental":
+        # Only events since the last refresh, only teams not yet at WORLD
+        processed_count = robotevents.create_qualifications_incremental(
+            session=session,
+            since=db.get_last_slow_update(session),
+            workers=workers,
+            progress_tracker=progress_tracker,
+        )
+    elif strategy == "events":
+        # One awards request per season event instead of one per team
+        processed_count = robotevents.create_qualifications_events(
+            session=session,
+            workers=workers,
+            progress_tracker=progress_tracker,
+        )
+    elif shards := _qualification_shards():
+        # Team ids split across processes, each with its own checkpoint
+        processed_count = sharding.create_qualifications_sharded(
+            session=session,
+            token=robotevents.token,
+            shards=shards,
+            workers=workers,
+            commit_interval=100,
+            progress_tracker=progress_tracker,
+            base_url=robotevents.base_url,
+        )
+    else:
+        all_teams = db.get_all_teams(session)
+        print(f"\nProcessing qualifications for {len(all_teams)} teams...")
+
+        processed_count = robotevents.create_qualifications_full(
+            session=session,  # Pass session for database operations
+            teams=all_teams,
+            resume=True,  # Enable resumption from last checkpoint
+            progress_tracker=progress_tracker,
+            commit_interval=100,  # One bulk upsert + commit every 100 teams
+            workers=workers,
+        )
+
+    print(f"Qualification creation completed! Processed {processed_count} teams.")
+
+    # Update metadata timestamp
+    db.set_update_time(session)
+    return processed_count
+
+
+def _qualification_shards() -> int:
+    """QUALIFICATION_SHARDS when sharding applies, else 0."""
+    shards = int(os.environ.get("QUALIFICATION_SHARDS", "1"))
+    if shards <= 1:
+        return 0
+    if os.environ.get("ROBOTEVENTS_RECORD"):
+        # The archive is a single zip written by one process
+        print("QUALIFICATION_SHARDS ignored while ROBOTEVENTS_RECORD is set; running in one process")
+        return 0
+    return shards
+
+
+def refresh_skills(session: Session, robotevents: RobotEvents) -> int:
+    """Refresh High School and Middle School skills; returns teams seen."""
+    seen = 0
+    with sql_profiler.profile("refresh_skills"):
+        for ms in (False, True):
+            diff = robotevents.parse_skills(session, ms)
+            if diff:
+                seen += diff.inserted + diff.changed + diff.unchanged
+    return seen
+
+
+def create_scheduler(token: str) -> Scheduler:
+    """
+    Scheduler with the skills and qualifications refresh jobs.
+
+    Cadence: SKILLS_REFRESH_MINUTES (default 60) and
+    QUALIFICATIONS_REFRESH_DAYS (default 7, first run due that long after
+    Metadata.last_slow_update, like main.py).
+    """
+    # one run per job across all API workers (serve --workers N)
+    scheduler = Scheduler(lease=db.JobLeases())
+
+    def skills() -> int:
+        with Session(db.get_engine()) as session:
+            return refresh_skills(session, make_robotevents(token))
+
+    def qualifications() -> int:
+        progress_tracker = make_progress_tracker()
+        try:
+            with Session(db.get_engine()) as session:
+                return refresh_qualifications(
+                    session, make_robotevents(token, progress_tracker), progress_tracker
+                )
+        finally:
+            progress_tracker.close()
+
+    scheduler.add_job(
+        "skills",
+        skills,
+        interval=timedelta(minutes=float(os.environ.get("SKILLS_REFRESH_MINUTES", "60"))),
+    )
+
+    qualifications_interval = timedelta(
+        days=float(os.environ.get("QUALIFICATIONS_REFRESH_DAYS", "7"))
+    )
+    with Session(db.get_engine()) as session:
+        last_update = db.get_last_slow_update(session)
+    scheduler.add_job(
+        "qualifications",
+        qualifications,
+        interval=qualifications_interval,
+        first_run=last_update + qualifications_interval,
+    )
+    return scheduler
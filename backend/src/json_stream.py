@@ -0,0 +1,88 @@
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Any]:  # pyright: ignore[reportExplicitAny]
+    """
+    Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Only the current, not yet complete element is buffered, so memory stays
+    bounded by the largest element rather than the whole document.
+
+    Raises:
+        ValueError: if the document is not a well-formed JSON array
+    """
+    text = codecs.getincrementaldecoder(encoding)()
+    chunk_iter = iter(chunks)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        try:
+            data = next(chunk_iter)
+        except StopIteration:
+            eof = True
+            buf = buf[pos:] + text.decode(b"", final=True)
+            pos = 0
+            return True
+        buf = buf[pos:] + text.decode(data)
+        pos = 0
+        return True
+
+    def skip_ws() -> bool:
+        """Advance past whitespace; False once the input is exhausted."""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return True
+            if not fill():
+                return False
+
+    if not skip_ws() or buf[pos] != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+
+    first = True
+    while True:
+        if not skip_ws():
+            raise ValueError("unterminated JSON array")
+        if buf[pos] == "]":
+            pos += 1
+            if skip_ws():
+                raise ValueError(f"unexpected data after JSON array: {buf[pos]!r}")
+            return
+        if not first:
+            if buf[pos] != ",":
+                raise ValueError(f"expected ',' in JSON array, got {buf[pos]!r}")
+            pos += 1
+            if not skip_ws():
+                raise ValueError("unterminated JSON array")
+        first = False
+
+        while True:
+            try:
+                item, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise ValueError("truncated JSON array") from None
+                continue
+            # a number cut by a chunk boundary decodes as a shorter number
+            # ("1" of "12", "-1" of "-1.5"), so only accept it once a delimiter
+            # follows or the input has ended
+            if (end == len(buf) or buf[end] not in _DELIMITERS) and fill():
+                continue
+            break
+        pos = end
+        yield item
@@ -0,0 +1,244 @@
+"""
+Process-wide metrics rendered in the Prometheus text format (GET /metrics).
+
+A deliberately small, dependency-free registry: counters and histograms with
+labels, enough for API route latency, RobotEvents upstream calls, database
+statement timing and connection pool checkout waits.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import Engine, event, make_url
+from sqlalchemy.pool import QueuePool
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind: str = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:  # pyright: ignore[reportExplicitAny]
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any):  # pyright: ignore[reportExplicitAny]
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:  # pyright: ignore[reportExplicitAny]
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (+Inf last)], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any):  # pyright: ignore[reportExplicitAny]
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:  # pyright: ignore[reportExplicitAny]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:  # pyright: ignore[reportExplicitAny]
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip((*self.buckets, float("inf")), counts):
+                    cumulative += n
+                    le = f'le="{_number(bound)}"'
+                    lines.append(
+                        f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+                    )
+                labels = _labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_number(total[0])}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register[M: Metric](self, metric: M) -> M:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for m in metrics for line in m.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+http_request_seconds = REGISTRY.register(
+    Histogram(
+        "aiq_http_request_duration_seconds",
+        "API request latency by route template, until the response headers are sent.",
+        ("method", "route", "status"),
+    )
+)
+robotevents_requests = REGISTRY.register(
+    Counter(
+        "aiq_robotevents_requests_total",
+        "RobotEvents.request calls by outcome, final status code and retries used.",
+        ("outcome", "status", "retries"),
+    )
+)
+robotevents_attempt_seconds = REGISTRY.register(
+    Histogram(
+        "aiq_robotevents_attempt_duration_seconds",
+        "Latency of individual HTTP attempts to RobotEvents by status code.",
+        ("status",),
+    )
+)
+db_statement_seconds = REGISTRY.register(
+    Histogram(
+        "aiq_db_statement_duration_seconds",
+        "Database statement execution time by SQL operation.",
+        ("operation",),
+        buckets=DB_BUCKETS,
+    )
+)
+db_pool_checkout_wait_seconds = REGISTRY.register(
+    Histogram(
+        "aiq_db_pool_checkout_wait_seconds",
+        "Time spent waiting for a connection from the pool.",
+        buckets=DB_BUCKETS,
+    )
+)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def _operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement run through engine (db_statement_seconds)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn: Any, cursor: Any, statement: str, *_: Any):  # pyright: ignore[reportExplicitAny, reportUnusedFunction]
+        conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn: Any, cursor: Any, statement: str, *_: Any):  # pyright: ignore[reportExplicitAny, reportUnusedFunction]
+        started: float = conn.info["metrics_start"].pop()
+        db_statement_seconds.observe(
+            time.perf_counter() - started, operation=_operation(statement)
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context: Any):  # pyright: ignore[reportExplicitAny, reportUnusedFunction]
+        # after_cursor_execute doesn't run for failed statements
+        conn = context.connection
+        if conn is not None and conn.info.get("metrics_start"):
+            _ = conn.info["metrics_start"].pop()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):  # pyright: ignore[reportImplicitOverride]
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait_seconds.observe(time.perf_counter() - start)
+
+
+def pool_class(url: str) -> type[QueuePool] | None:
+    """TimedQueuePool, except for in-memory SQLite which needs its own pool."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return None
+    return TimedQueuePool
@@ -0,0 +1,207 @@
+"""
+Schema migrations for tables that already exist in production.
+
+SQLModel.metadata.create_all only creates missing tables, so indexes added to
+tables.py later never reach an existing database. Each Migration below runs
+once and is recorded in schema_migrations.
+
+Usage (also `python cli.py migrate [--check]`):
+    python migrations.py            apply pending migrations
+    python migrations.py --check    verify the read queries use the indexes
+
+The API does not migrate on startup unless DB_MIGRATE_ON_STARTUP=1, so many
+workers booting at once never race on DDL.
+"""
+
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Connection, Engine, Index, func, text
+from sqlmodel import SQLModel, select
+
+import db
+import queries
+from tables import DataVersion, Qualification, Qualifications, SchemaMigration, Teams
+
+
+@dataclass
+class Migration:
+    id: str
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _table_index(model: type[SQLModel], name: str) -> Index:
+    table = model.__table__  # pyright: ignore[reportAttributeAccessIssue]
+    return next(index for index in table.indexes if index.name == name)  # pyright: ignore[reportAny]
+
+
+def _create_index(model: type[SQLModel], name: str) -> Callable[[Connection], None]:
+    def apply(conn: Connection):
+        _table_index(model, name).create(conn, checkfirst=True)
+
+    return apply
+
+
+def _create_unique_number_index(conn: Connection):
+    duplicates = conn.execute(
+        select(Teams.number)
+        .group_by(Teams.number)
+        .having(func.count() > 1)
+        .limit(10)
+    ).all()
+    if duplicates:
+        numbers = ", ".join(row[0] for row in duplicates)
+        raise RuntimeError(f"cannot add unique index on teams.number, duplicates: {numbers}")
+    _table_index(Teams, "ux_teams_number").create(conn, checkfirst=True)
+
+
+def _backfill_region_stats(conn: Connection):
+    regions = db.rebuild_region_stats(conn)
+    print(f"region_stats: {regions} (grade, region) rows")
+
+
+def _seed_data_version(conn: Connection):
+    if conn.execute(select(DataVersion.id).where(DataVersion.id == 1)).first() is None:
+        _ = conn.execute(
+            DataVersion.__table__.insert().values(id=1, version=0)  # pyright: ignore[reportAttributeAccessIssue]
+        )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(
+        "0001_teams_grade_region_rank",
+        "leaderboard filtered by grade and region, ordered by world_rank",
+        _create_index(Teams, "ix_teams_grade_region_rank"),
+    ),
+    Migration(
+        "0002_teams_grade_rank",
+        "leaderboard filtered by grade only, ordered by world_rank",
+        _create_index(Teams, "ix_teams_grade_rank"),
+    ),
+    Migration(
+        "0003_teams_region",
+        "DISTINCT region for /regions",
+        _create_index(Teams, "ix_teams_region"),
+    ),
+    Migration(
+        "0004_teams_number_unique",
+        "number_to_id lookups",
+        _create_unique_number_index,
+    ),
+    Migration(
+        "0005_qualifications_status",
+        "filtering qualifications by status",
+        _create_index(Qualifications, "ix_qualifications_status"),
+    ),
+    Migration(
+        "0006_region_stats",
+        "backfill per-region aggregates for /stats",
+        _backfill_region_stats,
+    ),
+    Migration(
+        "0007_data_version",
+        "shared data version for read caches and ETags across processes",
+        _seed_data_version,
+    ),
+]
+
+
+def migrate(engine: Engine) -> list[str]:
+    """
+    Create missing tables, then apply every migration not yet recorded.
+
+    Returns:
+        Ids of the migrations applied by this call
+    """
+    SQLModel.metadata.create_all(engine)
+    applied: list[str] = []
+    with engine.connect() as conn:
+        done = set(conn.execute(select(SchemaMigration.id)).scalars().all())
+    for migration in MIGRATIONS:
+        if migration.id in done:
+            continue
+        with engine.begin() as conn:
+            migration.apply(conn)
+            _ = conn.execute(
+                SchemaMigration.__table__.insert().values(  # pyright: ignore[reportAttributeAccessIssue]
+                    id=migration.id,
+                    description=migration.description,
+                    applied_at=datetime.now(),
+                )
+            )
+        print(f"applied migration {migration.id}: {migration.description}")
+        applied.append(migration.id)
+    return applied
+
+
+# query name -> (statement, index the planner is expected to pick)
+def _checked_queries():
+    return {
+        "lb": (
+            queries.leaderboard("High School", None, [Qualification.NONE], 20),
+            "ix_teams_grade_rank",
+        ),
+        "lb_region": (
+            queries.leaderboard("High School", "California - Region 4", [Qualification.NONE], 20),
+            "ix_teams_grade_region_rank",
+        ),
+        "regions": (queries.regions(), "ix_teams_region"),
+        "number_to_id": (
+            select(Teams.id).where(Teams.number == "1A"),
+            "ux_teams_number",
+        ),
+    }
+
+
+class UnsupportedDialect(Exception):
+    """The index check has no EXPLAIN parser for this database dialect."""
+
+
+def _indexes_used(conn: Connection, sql: str) -> set[str]:
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        rows = conn.execute(text("EXPLAIN " + sql)).mappings().all()
+        return {row["key"] for row in rows if row["key"]}
+    if dialect == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql)).all()
+        used: set[str] = set()
+        for row in rows:
+            detail: str = row[-1]
+            if " INDEX " in detail:
+                used.add(detail.split(" INDEX ", 1)[1].split(" ", 1)[0])
+        return used
+    raise UnsupportedDialect(dialect)
+
+
+def check_indexes(engine: Engine) -> dict[str, tuple[str, set[str] | None]]:
+    """
+    EXPLAIN the hot read queries and report the indexes they use.
+
+    Only MySQL and SQLite query plans are understood; on other databases
+    every query is reported as skipped.
+
+    Returns:
+        query name -> (expected index, indexes the planner chose, or None if
+        the query was skipped); the check passes when the expected index is
+        among those chosen
+    """
+    results: dict[str, tuple[str, set[str] | None]] = {}
+    with engine.connect() as conn:
+        for name, (stmt, expected) in _checked_queries().items():
+            sql = str(
+                stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            )
+            try:
+                results[name] = (expected, _indexes_used(conn, sql))
+            except UnsupportedDialect:
+                results[name] = (expected, None)
+    return results
+
+
+if __name__ == "__main__":
+    import cli
+
+    sys.exit(cli.main(["migrate", *sys.argv[1:]]))
@@ -1,8 +1,134 @@
+import atexit
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, TextIO
+
+
+class LogWriter:
+    """
+    Buffered log writer that does its file and console I/O on a background thread.
+
+    Callers only enqueue records. The writer keeps the file open, flushes once
+    `flush_bytes` are buffered or `flush_interval` seconds have passed, rotates
+    the file to .1 ... .N after `max_bytes`, and drains everything on close()
+    (also registered with atexit).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        json_lines: bool = False,
+        quiet: bool = False,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+    ):
+        self.path = path
+        self.json_lines = json_lines
+        self.quiet = quiet
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue[tuple[datetime, str, dict[str, Any]] | None] = (  # pyright: ignore[reportExplicitAny]
+            queue.SimpleQueue()
+        )
+        self._file: Optional[TextIO] = None
+        self._buffered = 0
+        # bytes in the current file, kept here: tell() would flush the buffer
+        self._size = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="progress-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, when: datetime, message: str, fields: dict[str, Any]):  # pyright: ignore[reportExplicitAny]
+        if not self._closed:
+            self._queue.put((when, message, fields))
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        # drop the atexit reference so closed writers can be collected
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._thread.join()
+
+    def _format(self, when: datetime, message: str, fields: dict[str, Any]) -> str:  # pyright: ignore[reportExplicitAny]
+        if self.json_lines:
+            record = {"ts": when.isoformat(timespec="seconds"), "message": message, **fields}
+            return json.dumps(record, default=str, ensure_ascii=False) + "\n"
+        return f"[{when.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n"
+
+    def _open(self) -> TextIO:
+        if self._file is None:
+            self._file = open(
+                self.path, "a", encoding="utf-8", buffering=self.flush_bytes
+            )
+            self._size = os.fstat(self._file.fileno()).st_size
+        return self._file
+
+    def _flush(self):
+        if self._file is not None:
+            self._file.flush()
+        self._buffered = 0
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item:
+                when, message, fields = item
+                line = self._format(when, message, fields)
+                try:
+                    f = self._open()
+                    _ = f.write(line)
+                    size = len(line.encode())
+                    self._buffered += size
+                    self._size += size
+                    if self.max_bytes and self._size >= self.max_bytes:
+                        self._rotate()
+                        self._buffered = 0
+                        self._size = 0
+                except OSError as e:
+                    print(f"ERROR: Failed to write to log file: {e}")
+                if not self.quiet:
+                    print(f"[{when.strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+            if (
+                self._buffered >= self.flush_bytes
+                or time.monotonic() - last_flush >= self.flush_interval
+            ):
+                self._flush()
+                last_flush = time.monotonic()
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
 
 class ProgressTracker:
@@ -11,14 +137,35 @@ class ProgressTracker:
     Writes progress to an external log file to enable resumption after failures.
     """
 
-    def __init__(self, log_file: str = "qualification_progress.log"):
+    def __init__(
+        self,
+        log_file: str = "qualification_progress.log",
+        quiet: bool = False,
+        json_lines: bool = False,
+        max_bytes: int = 10 * 1024 * 1024,
+        progress_file: str = "qualification_progress.json",
+    ):
+        """
+        Args:
+            log_file: Path of the progress log
+            quiet: Don't echo log lines to the console
+            json_lines: Write one JSON object per line instead of plain text
+            max_bytes: Rotate the log once it grows past this size (0 disables)
+            progress_file: Path of the resume checkpoint (one per shard when sharded)
+        """
         self.log_file = Path(log_file)
-        self.progress_file = Path("qualification_progress.json")
+        self.progress_file = Path(progress_file)
         self.last_processed_team_id: Optional[int] = None
         self.last_processed_index: int = -1
         self.total_teams: int = 0
         self.start_time: Optional[datetime] = None
         self.processed_count: int = 0
+        # request() may log and count cache lookups from worker threads
+        self._lock = threading.Lock()
+        self._writer = LogWriter(
+            self.log_file, json_lines=json_lines, quiet=quiet, max_bytes=max_bytes
+        )
+        self.cache_counts: dict[str, int] = {"hit": 0, "revalidated": 0, "miss": 0}
 
     def initialize(self, total_teams: int, resume: bool = True) -> int:
         """
@@ -101,13 +248,34 @@ class ProgressTracker:
             f"[{self.processed_count}/{self.total_teams}] Team {team_id} → {qualification_status} | "
             f"Progress: {progress_pct:.1f}% | "
             f"Avg: {avg_time_per_team:.2f}s/team | "
-            f"ETA: {estimated_remaining / 60:.1f}m"
+            f"ETA: {estimated_remaining / 60:.1f}m",
+            processed=self.processed_count,
+            total=self.total_teams,
+            team_id=team_id,
+            status=qualification_status,
+            avg_seconds=round(avg_time_per_team, 3),
+            eta_seconds=round(estimated_remaining),
         )
 
         # ONLY save checkpoint to file if force_save is True
         if force_save:
             self._save_progress()
 
+    def record_cache(self, outcome: str):
+        """Count a response cache lookup ("hit", "revalidated" or "miss")."""
+        with self._lock:
+            self.cache_counts[outcome] = self.cache_counts.get(outcome, 0) + 1
+
+    def cache_summary(self) -> str:
+        hits = self.cache_counts["hit"] + self.cache_counts["revalidated"]
+        total = hits + self.cache_counts["miss"]
+        rate = hits / total * 100 if total > 0 else 0
+        return (
+            f"Cache: {self.cache_counts['hit']} hits, "
+            f"{self.cache_counts['revalidated']} revalidated, "
+            f"{self.cache_counts['miss']} misses ({rate:.1f}% served locally)"
+        )
+
     def complete(self):
         """Mark the qualification creation as complete and clean up progress file."""
         elapsed = (
@@ -117,6 +285,8 @@ class ProgressTracker:
             f"COMPLETED qualification creation for {self.processed_count} teams "
             f"in {elapsed:.0f}s ({elapsed / 60:.1f}m)"
         )
+        if any(self.cache_counts.values()):
+            self._log(self.cache_summary())
         self._clear_progress()
 
     def _save_progress(self):
@@ -142,15 +312,10 @@ class ProgressTracker:
             except Exception as e:
                 self._log(f"WARNING: Failed to delete progress file: {e}")
 
-    def _log(self, message: str):
-        """Write a log message to the log file."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
+    def close(self):
+        """Flush and close the log file."""
+        self._writer.close()
 
-        try:
-            with open(self.log_file, "a") as f:
-                f.write(log_message)
-            # Also print to console
-            print(log_message.strip())
-        except Exception as e:
-            print(f"ERROR: Failed to write to log file: {e}")
+    def _log(self, message: str, **fields: Any):  # pyright: ignore[reportExplicitAny]
+        """Queue a log message; extra fields are kept in JSON-lines mode."""
+        self._writer.write(datetime.now(), message, fields)
@@ -0,0 +1,78 @@
+from sqlmodel import select
+from tables import Qualification, Qualifications, RegionScoreBucket, RegionStats, Teams
+
+
+def leaderboard(
+    grade: str,
+    region: str | None,
+    exclude_statuses: list[Qualification],
+    limit: int,
+):
+    query = (
+        select(
+            Teams.number,
+            Qualifications.status,
+            Teams.organization,
+            Teams.country,
+            Teams.region,
+            Teams.world_rank,
+            Teams.score,
+            Teams.driver,
+            Teams.programming,
+        )
+        .join(Qualifications)
+        .where(Teams.grade == grade)
+        .order_by(Teams.world_rank)
+        .limit(limit)
+    )
+
+    for excluded_status in exclude_statuses:
+        query = query.where(Qualifications.status != excluded_status)
+
+    if region is not None:
+        query = query.where(Teams.region == region)
+
+    return query
+
+
+def regions():
+    return select(Teams.region).distinct().order_by(Teams.region)
+
+
+def qualifications(after: int | None = None, limit: int | None = None):
+    """Team qualifications in team id order; `after` is a keyset cursor (team id)."""
+    query = (
+        select(
+            Teams.id,
+            Teams.number,
+            Teams.organization,
+            Qualifications.status,
+        )
+        .join(Qualifications)
+        .order_by(Teams.id)
+    )
+    if after is not None:
+        query = query.where(Teams.id > after)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def region_stats(grade: str | None = None):
+    """One region_stats row per (grade, region); reading them never touches teams."""
+    query = select(RegionStats).order_by(RegionStats.grade, RegionStats.region)
+    if grade is not None:
+        query = query.where(RegionStats.grade == grade)
+    return query
+
+
+def region_score_buckets(grade: str | None = None):
+    query = select(
+        RegionScoreBucket.grade,
+        RegionScoreBucket.region,
+        RegionScoreBucket.bucket,
+        RegionScoreBucket.teams,
+    ).where(RegionScoreBucket.teams > 0)
+    if grade is not None:
+        query = query.where(RegionScoreBucket.grade == grade)
+    return query
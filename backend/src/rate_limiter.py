@@ -0,0 +1,85 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting requests per second across all callers.
+
+    A 429 pauses every caller until the server's Retry-After has elapsed and
+    halves the refill rate; each success afterwards nudges the rate back up
+    towards the configured ceiling.
+    """
+
+    def __init__(self, rate: float = 5, burst: int = 10, min_rate: float = 0.5):
+        self._lock = threading.Lock()
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def configure(self, rate: float, burst: int):
+        with self._lock:
+            self.max_rate = rate
+            self.min_rate = min(self.min_rate, rate)
+            self.rate = rate
+            self.burst = burst
+            self.tokens = min(self.tokens, float(burst))
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, delay: float):
+        """Pause all callers for delay seconds and back off the rate."""
+        with self._lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + delay)
+            self._refill(now)
+            self.tokens = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def success(self):
+        """Recover the rate additively after throttling."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
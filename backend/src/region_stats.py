@@ -0,0 +1,262 @@
+"""
+Per (grade, region) aggregates for GET /stats, maintained incrementally.
+
+Write paths in db describe each change as a team's skills before and after
+(`TeamSkills`) or a qualification status change. `RegionDeltas` folds those
+into per-region deltas: team counts, qualification counts, score totals and
+histogram buckets, and candidate top scores. db then applies them to
+region_stats / region_score_buckets with one upsert per table, in the same
+transaction as the change itself. /stats reads one row per region plus at
+most SCORE_BUCKETS histogram rows per region, and never reads teams.
+
+Counts and sums are exact. A top score only rises through a delta. A change
+that lowers a team's score, which is rare because skills scores normally
+only go up, marks the region so db recomputes its tops from teams.
+"""
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Literal
+
+from tables import Qualification, RegionStats
+
+SCORE_BUCKET_WIDTH = 10
+SCORE_BUCKETS = 64
+PERCENTILES = (25, 50, 75, 90)
+
+# Additive region_stats columns, and the ones tracked as (top value, team number)
+COUNTS = ("teams", "regional", "world", "score_total")
+TOPS = ("score", "driver", "programming")
+
+_LEVEL_COLUMNS = {Qualification.REGIONAL: "regional", Qualification.WORLD: "world"}
+
+
+def score_bucket(score: int) -> int:
+    return min(max(score, 0) // SCORE_BUCKET_WIDTH, SCORE_BUCKETS - 1)
+
+
+@dataclass(frozen=True)
+class TeamSkills:
+    """The Teams columns region_stats depends on, apart from the qualification."""
+
+    grade: str
+    region: str
+    country: str
+    number: str
+    score: int
+    driver: int
+    programming: int
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "TeamSkills":  # pyright: ignore[reportExplicitAny]
+        return cls(**{f.name: row[f.name] for f in fields(cls)})
+
+
+@dataclass
+class RegionDelta:
+    country: str
+    teams: int = 0
+    regional: int = 0
+    world: int = 0
+    score_total: int = 0
+    buckets: Counter[int] = field(default_factory=Counter)
+    # field -> (value, team number) of the best team added in this delta
+    tops: dict[str, tuple[int, str]] = field(default_factory=dict)
+    recompute: bool = False
+
+    def apply(self, stats: RegionStats):
+        """Apply to a loaded row (db's fallback for dialects without upserts)."""
+        for column in COUNTS:
+            setattr(stats, column, getattr(stats, column) + getattr(self, column))
+        for name, (value, number) in self.tops.items():
+            if value > getattr(stats, f"top_{name}"):
+                setattr(stats, f"top_{name}", value)
+                setattr(stats, f"top_{name}_team", number)
+
+
+class RegionDeltas:
+    """Region stat changes accumulated over one write batch."""
+
+    def __init__(self):
+        self.regions: dict[tuple[str, str], RegionDelta] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.regions)
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def _delta(self, grade: str, region: str, country: str) -> RegionDelta:
+        delta = self.regions.get((grade, region))
+        if delta is None:
+            delta = self.regions[grade, region] = RegionDelta(country)
+        return delta
+
+    def skills(self, before: TeamSkills | None, after: TeamSkills):
+        """A team was inserted (before is None) or its skills changed."""
+        if before == after:
+            return
+        if before is not None:
+            delta = self._delta(before.grade, before.region, before.country)
+            delta.teams -= 1
+            delta.score_total -= before.score
+            delta.buckets[score_bucket(before.score)] -= 1
+            moved = (before.grade, before.region) != (after.grade, after.region)
+            if moved or any(getattr(after, n) < getattr(before, n) for n in TOPS):
+                delta.recompute = True
+
+        delta = self._delta(after.grade, after.region, after.country)
+        delta.teams += 1
+        delta.score_total += after.score
+        delta.buckets[score_bucket(after.score)] += 1
+        for name in TOPS:
+            value: int = getattr(after, name)
+            if name not in delta.tops or value > delta.tops[name][0]:
+                delta.tops[name] = (value, after.number)
+
+    def status(
+        self,
+        grade: str,
+        region: str,
+        country: str,
+        before: Qualification,
+        after: Qualification,
+    ):
+        """A team's qualification went from `before` to `after` (NONE if it had none)."""
+        if before == after:
+            return
+        delta = self._delta(grade, region, country)
+        if before in _LEVEL_COLUMNS:
+            setattr(delta, _LEVEL_COLUMNS[before], getattr(delta, _LEVEL_COLUMNS[before]) - 1)
+        if after in _LEVEL_COLUMNS:
+            setattr(delta, _LEVEL_COLUMNS[after], getattr(delta, _LEVEL_COLUMNS[after]) + 1)
+
+    def stats_rows(self) -> list[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+        """
+        region_stats rows holding the deltas (added on conflict) and candidate tops.
+
+        Rows (and bucket_rows) come in primary key order, so concurrent
+        writers lock region rows in the same order and cannot deadlock.
+        """
+        rows: list[dict[str, Any]] = []  # pyright: ignore[reportExplicitAny]
+        for (grade, region), delta in sorted(self.regions.items()):
+            row: dict[str, Any] = {"grade": grade, "region": region, "country": delta.country}  # pyright: ignore[reportExplicitAny]
+            for column in COUNTS:
+                row[column] = getattr(delta, column)
+            for name in TOPS:
+                value, number = delta.tops.get(name, (0, None))
+                row[f"top_{name}"] = value
+                row[f"top_{name}_team"] = number
+            rows.append(row)
+        return rows
+
+    def bucket_rows(self) -> list[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+        return [
+            {"grade": grade, "region": region, "bucket": bucket, "teams": n}
+            for (grade, region), delta in sorted(self.regions.items())
+            for bucket, n in sorted(delta.buckets.items())
+            if n
+        ]
+
+    @property
+    def recompute(self) -> list[tuple[str, str]]:
+        """Regions whose tops may have dropped and must be recomputed from teams."""
+        return sorted(key for key, delta in self.regions.items() if delta.recompute)
+
+
+def percentile(histogram: Mapping[int, int], p: float, top: int) -> float:
+    """Approximate p-th percentile score, interpolated within SCORE_BUCKET_WIDTH buckets."""
+    total = sum(histogram.values())
+    if total <= 0:
+        return 0.0
+    rank = p / 100 * total
+    seen = 0
+    for bucket in sorted(histogram):
+        n = histogram[bucket]
+        if n <= 0:
+            continue
+        if seen + n >= rank:
+            value = (bucket + (rank - seen) / n) * SCORE_BUCKET_WIDTH
+            # the last bucket is open-ended, and no team scores above the top
+            return round(min(value, top), 1)
+        seen += n
+    return float(top)
+
+
+@dataclass
+class _Aggregate:
+    grade: str
+    country: str
+    region: str | None
+    teams: int = 0
+    regional: int = 0
+    world: int = 0
+    score_total: int = 0
+    tops: dict[str, tuple[int, str | None]] = field(default_factory=dict)
+    histogram: Counter[int] = field(default_factory=Counter)
+
+    def add(self, stats: RegionStats, histogram: Mapping[int, int]):
+        for column in COUNTS:
+            setattr(self, column, getattr(self, column) + getattr(stats, column))
+        for name in TOPS:
+            value: int = getattr(stats, f"top_{name}")
+            if name not in self.tops or value > self.tops[name][0]:
+                self.tops[name] = (value, getattr(stats, f"top_{name}_team"))
+        self.histogram.update(histogram)
+
+    def entry(self) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        top_score = self.tops["score"][0]
+        entry: dict[str, Any] = {"grade": self.grade}  # pyright: ignore[reportExplicitAny]
+        if self.region is not None:
+            entry["region"] = self.region
+        entry |= {
+            "country": self.country,
+            "teams": self.teams,
+            "qualifications": {
+                Qualification.NONE.name: self.teams - self.regional - self.world,
+                Qualification.REGIONAL.name: self.regional,
+                Qualification.WORLD.name: self.world,
+            },
+            "score": {
+                "mean": round(self.score_total / self.teams, 1),
+                **{f"p{p}": percentile(self.histogram, p, top_score) for p in PERCENTILES},
+                "max": top_score,
+            },
+            "top": {
+                name: {"number": number, "value": value}
+                for name, (value, number) in self.tops.items()
+            },
+        }
+        return entry
+
+
+def summarize(
+    stats: Iterable[RegionStats],
+    buckets: Iterable[tuple[str, str, int, int]],
+    by: Literal["region", "country"] = "region",
+) -> list[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+    """
+    /stats entries from region_stats rows and (grade, region, bucket, teams) rows.
+
+    With by="country" the regions of each country are merged: counts add up,
+    histograms are combined and tops are the best of the regions.
+    """
+    histograms: defaultdict[tuple[str, str], Counter[int]] = defaultdict(Counter)
+    for grade, region, bucket, teams in buckets:
+        histograms[grade, region][bucket] += teams
+
+    aggregates: dict[tuple[str, str], _Aggregate] = {}
+    for row in stats:
+        if row.teams <= 0:
+            continue
+        if by == "region":
+            key = (row.grade, row.region)
+            aggregate = aggregates[key] = _Aggregate(row.grade, row.country, row.region)
+        else:
+            key = (row.grade, row.country)
+            aggregate = aggregates.get(key)
+            if aggregate is None:
+                aggregate = aggregates[key] = _Aggregate(row.grade, row.country, None)
+        aggregate.add(row, histograms[row.grade, row.region])
+    return [aggregates[key].entry() for key in sorted(aggregates)]
@@ -0,0 +1,81 @@
+import atexit
+import json
+import threading
+import zipfile
+from typing import Any, Literal, Optional
+
+INDEX = "index.json"
+
+
+class ResponseArchive:
+    """
+    Single-file record of RobotEvents responses, for replaying runs offline.
+
+    The archive is a zip: one deflated member per response plus an index.json
+    mapping each request path to its member, written when the archive is
+    closed. In "record" mode every response is appended (a path requested
+    again overwrites its index entry, so the last response wins); in "replay"
+    mode responses are served from the archive and nothing touches the
+    network. Failed requests are recorded as null so replays fail the same way.
+    """
+
+    def __init__(self, path: str, mode: Literal["record", "replay"] = "replay"):
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._index: dict[str, str] = {}
+        self._closed = False
+        if mode == "record":
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+            _ = atexit.register(self.close)
+        else:
+            self._zip = zipfile.ZipFile(path, "r")
+            self._index = json.loads(self._zip.read(INDEX))
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get_raw(self, path: str) -> Optional[bytes]:
+        """The recorded bytes for path, or None if it was never recorded."""
+        with self._lock:
+            member = self._index.get(path)
+            return self._zip.read(member) if member is not None else None
+
+    def get(self, path: str) -> Any | None:  # pyright: ignore[reportExplicitAny]
+        raw = self.get_raw(path)
+        return json.loads(raw) if raw is not None else None
+
+    def put_raw(self, path: str, content: bytes):
+        with self._lock:
+            if self._closed:
+                return
+            member = f"{len(self._zip.filelist):07d}.json"
+            self._zip.writestr(member, content)
+            self._index[path] = member
+
+    def put(self, path: str, body: Any):  # pyright: ignore[reportExplicitAny, reportAny]
+        self.put_raw(path, json.dumps(body, separators=(",", ":")).encode())
+
+    def close(self):
+        """Write the index (when recording) and close the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self.mode == "record":
+                self._zip.writestr(INDEX, json.dumps(self._index))
+                atexit.unregister(self.close)
+            self._zip.close()
+
+    def __enter__(self) -> "ResponseArchive":
+        return self
+
+    def __exit__(self, *_: object):
+        self.close()
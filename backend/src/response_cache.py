@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+
+@dataclass
+class CachedResponse:
+    path: str
+    body: Any  # pyright: ignore[reportExplicitAny]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class ResponseCache:
+    """
+    Disk-backed cache of RobotEvents JSON responses, keyed by request path.
+
+    Entries younger than `ttl` seconds are served without touching the network.
+    Older entries are revalidated with If-None-Match / If-Modified-Since so an
+    unchanged payload costs a 304 instead of a full download.
+    """
+
+    def __init__(self, directory: str = ".robotevents_cache", ttl: float = 86400):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, path: str) -> Path:
+        return self.directory / (hashlib.sha256(path.encode()).hexdigest() + ".json")
+
+    def get(self, path: str) -> Optional[CachedResponse]:
+        """Return the cached entry for path, or None if missing or unreadable."""
+        try:
+            with open(self._file(path), "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("path") != path:
+            return None
+        return CachedResponse(
+            path=path,
+            body=data["body"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            fetched_at=data.get("fetched_at", 0),
+        )
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def put(
+        self,
+        path: str,
+        body: Any,  # pyright: ignore[reportExplicitAny, reportAny]
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Store a response, writing to a temp file first so readers never see a partial entry."""
+        target = self._file(path)
+        tmp = target.with_suffix(f".{os.getpid()}.{time.monotonic_ns()}.tmp")
+        data = {
+            "path": path,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, target)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def touch(self, entry: CachedResponse):
+        """Mark a revalidated entry as fresh again."""
+        self.put(entry.path, entry.body, entry.etag, entry.last_modified)
@@ -1,29 +1,103 @@
+import json
 import logging
 import time
-from typing import Any, Optional
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional, TypeVar
 import requests
+from requests.adapters import HTTPAdapter
 from enum import Enum
 from sqlmodel import Session, select
 import db
+import metrics
 from tables import Qualification, Qualifications, Teams
+from json_stream import iter_json_array
 from progress_tracker import ProgressTracker
+from rate_limiter import TokenBucket, parse_retry_after
+from response_archive import ResponseArchive
+from response_cache import ResponseCache
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ROBOTEVENTS_URL = "https://www.robotevents.com/api"
+
+
+def prefetch_ordered(
+    fn: Callable[[T], R], items: Iterable[T], workers: int
+) -> Generator[Future[R], None, None]:
+    """
+    Run fn over items on a thread pool, yielding futures in input order.
+
+    At most 2 * workers calls are in flight at once, so the caller can consume
+    results sequentially (e.g. to checkpoint by index) while the next batch of
+    requests is already being fetched. Pending calls are cancelled when the
+    generator is closed.
+    """
+    workers = max(1, workers)
+    pending: deque[Future[R]] = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            for future in pending:
+                _ = future.cancel()
 
 
 class RobotEvents:
     token: str
     header: dict[str, str]
+    base_url: str
     base: str
     season: int
     logger: logging.Logger = logging.getLogger(__name__)
     progress_tracker: Optional[ProgressTracker] = None
+    cache: Optional[ResponseCache] = None
+    archive: Optional[ResponseArchive] = None
+    # Shared by every instance (and worker thread) in the process
+    rate_limiter: TokenBucket = TokenBucket(rate=5, burst=10)
 
-    def __init__(self, token: str, progress_tracker: Optional[ProgressTracker] = None):
+    def __init__(
+        self,
+        token: str,
+        progress_tracker: Optional[ProgressTracker] = None,
+        cache: Optional[ResponseCache] = None,
+        pool_size: int = 16,
+        rate_limiter: Optional[TokenBucket] = None,
+        base_url: str = ROBOTEVENTS_URL,
+        archive: Optional[ResponseArchive] = None,
+    ):
         self.token = token
-        self.base = "https://www.robotevents.com/api/v2"
+        # base_url also serves the unversioned season skills endpoint
+        self.base_url = base_url
+        self.base = f"{base_url}/v2"
         self.season = 197
         # self.season = 190
         self.header = {"Authorization": f"Bearer {token}"}
         self.progress_tracker = progress_tracker
+        self.cache = cache
+        self.archive = archive
+        if rate_limiter is not None:
+            self.rate_limiter = rate_limiter
+
+        # One keep-alive pool shared by every request; sized for concurrent workers
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+
+    def _record_cache(self, outcome: str):
+        if self.progress_tracker:
+            self.progress_tracker.record_cache(outcome)
 
     def request(
         self,
@@ -35,6 +109,17 @@ class RobotEvents:
         """
         Make an API request with exponential backoff retry logic.
 
+        With a ResponseArchive in replay mode the recorded response is returned
+        and nothing is sent; in record mode every result (None included) is
+        written to the archive.
+
+        Every attempt first takes a token from the shared rate limiter. A 429
+        pauses all callers for the server's Retry-After (or the backoff delay
+        if absent) instead of only sleeping this caller.
+
+        If a ResponseCache is configured, fresh entries are returned without a
+        request and stale ones are revalidated with ETag / Last-Modified.
+
         Args:
             path: API endpoint path (must start with /)
             max_retries: Maximum number of retry attempts (default: 5)
@@ -44,18 +129,60 @@ class RobotEvents:
         Returns:
             JSON response data or None on failure
         """
+        if self.archive is not None:
+            if self.archive.replaying:
+                if path not in self.archive:
+                    self.logger.error("not in archive %s: %s", self.archive.path, path)
+                return self.archive.get(path)  # pyright: ignore[reportAny]
+            body = self._request(path, max_retries, base_delay, max_delay)  # pyright: ignore[reportAny]
+            self.archive.put(path, body)
+            return body  # pyright: ignore[reportAny]
+        return self._request(path, max_retries, base_delay, max_delay)
+
+    def _request(
+        self, path: str, max_retries: int, base_delay: float, max_delay: float
+    ) -> Any | None:  # pyright: ignore[reportExplicitAny]
         if not path.startswith("/"):
             error_msg = f"ERROR: path needs to start with a forward slash: {path}"
             self.logger.error(error_msg)
             if self.progress_tracker:
                 self.progress_tracker._log(error_msg)
+            self._count("invalid", "none", 0)
             return None
         url = self.base + path
 
+        cached = self.cache.get(path) if self.cache else None
+        if self.cache and cached and self.cache.is_fresh(cached):
+            self._record_cache("hit")
+            self._count("cache_hit", "none", 0)
+            return cached.body  # pyright: ignore[reportAny]
+
+        headers = dict(self.header)
+        if cached:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        status: int | str = "none"
         for attempt in range(max_retries):
+            sent = time.perf_counter()
             try:
-                res = requests.get(url, headers=self.header)
+                self.rate_limiter.acquire()
+                sent = time.perf_counter()
+                res = self.http.get(url, headers=headers)
+                status = res.status_code
+                metrics.robotevents_attempt_seconds.observe(
+                    time.perf_counter() - sent, status=status
+                )
+                if self.cache and cached and res.status_code == 304:
+                    self.rate_limiter.success()
+                    self.cache.touch(cached)
+                    self._record_cache("revalidated")
+                    self._count("not_modified", status, attempt)
+                    return cached.body  # pyright: ignore[reportAny]
                 res.raise_for_status()
+                self.rate_limiter.success()
                 # Log successful request on first attempt or after retry
                 if attempt > 0:
                     success_msg = (
@@ -64,16 +191,37 @@ class RobotEvents:
                     self.logger.info(success_msg)
                     if self.progress_tracker:
                         self.progress_tracker._log(success_msg)
-                return res.json()  # pyright: ignore[reportAny]
+                body = res.json()  # pyright: ignore[reportAny]
+                if self.cache:
+                    self.cache.put(
+                        path,
+                        body,
+                        etag=res.headers.get("ETag"),
+                        last_modified=res.headers.get("Last-Modified"),
+                    )
+                    self._record_cache("miss")
+                self._count("ok", status, attempt)
+                return body  # pyright: ignore[reportAny]
 
             except requests.HTTPError as exc:
-                status_code = exc.response.status_code if exc.response else "unknown"
+                response = exc.response
+                status_code = response.status_code if response is not None else "unknown"
                 error_msg = f"✗ HTTP ERROR [{status_code}]: {path} (attempt {attempt + 1}/{max_retries})"
                 self.logger.error(error_msg)
                 if self.progress_tracker:
                     self.progress_tracker._log(error_msg)
 
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and response is not None and status_code == 429:
+                    delay = parse_retry_after(response.headers.get("Retry-After"))
+                    if delay is None:
+                        delay = min(base_delay * (2**attempt), max_delay)
+                    # The next acquire() waits out the pause for every worker
+                    self.rate_limiter.throttle(delay)
+                    retry_msg = f"  ⟳ RATE LIMITED: pausing all requests for {delay:.1f} seconds..."
+                    self.logger.warning(retry_msg)
+                    if self.progress_tracker:
+                        self.progress_tracker._log(retry_msg)
+                elif attempt < max_retries - 1:
                     # Exponential backoff: 2, 4, 8, 16, 32, ... (capped at max_delay)
                     delay = min(base_delay * (2**attempt), max_delay)
                     retry_msg = (
@@ -90,6 +238,10 @@ class RobotEvents:
                         self.progress_tracker._log(final_msg)
 
             except requests.RequestException as exc:
+                status = "error"
+                metrics.robotevents_attempt_seconds.observe(
+                    time.perf_counter() - sent, status=status
+                )
                 error_msg = f"✗ REQUEST ERROR: {type(exc).__name__} - {path} (attempt {attempt + 1}/{max_retries})"
                 self.logger.error(error_msg)
                 if self.progress_tracker:
@@ -111,8 +263,51 @@ class RobotEvents:
                     if self.progress_tracker:
                         self.progress_tracker._log(final_msg)
 
+        self._count("failed", status, max_retries - 1)
         return None
 
+    def _count(self, outcome: str, status: int | str, retries: int):
+        metrics.robotevents_requests.inc(outcome=outcome, status=status, retries=retries)
+
+    def paginate(
+        self, path: str, per_page: int = 250, workers: int = 4
+    ) -> Iterator[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+        """
+        Stream every item of a paginated v2 list endpoint.
+
+        The first page is fetched on its own to learn meta.last_page; the
+        remaining pages are then prefetched on `workers` threads and yielded in
+        order, so callers can start consuming before the last page arrives.
+
+        Args:
+            path: API endpoint path, with or without a query string
+            per_page: Page size to request (the API caps this at 250)
+            workers: Number of pages fetched concurrently (default: 4)
+
+        Raises:
+            RuntimeError: if a page could not be fetched after retries
+        """
+        sep = "&" if "?" in path else "?"
+
+        def fetch_page(page: int) -> list[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+            res = self.request(f"{path}{sep}per_page={per_page}&page={page}")
+            if not res:
+                raise RuntimeError(f"failed GET on page {page} of {path}")
+            return res["data"]  # pyright: ignore[reportAny]
+
+        first = self.request(f"{path}{sep}per_page={per_page}&page=1")
+        if not first:
+            raise RuntimeError(f"failed GET on page 1 of {path}")
+        yield from first["data"]
+
+        last_page: int = first["meta"]["last_page"]
+        pages = prefetch_ordered(fetch_page, range(2, last_page + 1), workers)
+        try:
+            for page in pages:
+                yield from page.result()
+        finally:
+            pages.close()
+
     def get_qualifications(self, robotevents_id: int) -> Qualification:
         awards = self.request(
             f"/teams/{str(robotevents_id)}/awards?season%5B%5D={self.season}"
@@ -155,114 +350,128 @@ class RobotEvents:
     #     )
     #     return team
     #
-    def parse_skills(self, session, ms: bool):
+    @staticmethod
+    def skills_row(team_data: dict[str, Any]) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        """Flatten one season skills entry into a Teams column mapping."""
+        tt = team_data["team"]
+        country: str = tt["country"]  # pyright: ignore[reportAny]
+        region: str | None = tt["eventRegion"]
+        if not region:
+            region = country
+        return {
+            "id": tt["id"],
+            "number": tt["team"],
+            "organization": tt["organization"],
+            "country": country,
+            "region": region,
+            "grade": tt["gradeLevel"],
+            "world_rank": team_data["rank"],
+            "score": team_data["scores"]["score"],
+            "programming": team_data["scores"]["programming"],
+            "driver": team_data["scores"]["driver"],
+        }
+
+    def parse_skills(
+        self, session: Session, ms: bool, chunk_size: int = 1000, stream: bool = True
+    ):
         """
         Parse skills rankings and update/create teams in the database.
 
         For existing teams: updates world_rank, score, programming, and driver fields
         For new teams: creates full team record with all fields
 
+        Rows are compared against the stored values and only new or changed
+        teams are written (db.upsert_teams), in chunks of `chunk_size`. With
+        `stream`, the response body is parsed incrementally and each chunk is
+        written as soon as it has been read, so memory stays flat and writes
+        start before the download finishes.
+
         Args:
             session: SQLModel Session object for database operations
             ms: Boolean - True for Middle School, False for High School
+            chunk_size: Number of teams per upsert statement (default: 1000)
+            stream: Parse the payload incrementally (default: True)
+
+        Returns:
+            db.SkillsDiff with inserted/changed/unchanged counts, or None on failure
         """
         if ms:
-            url = f"https://www.robotevents.com/api/seasons/{self.season}/skills?post_season=0&grade_level=Middle%20School"
+            url = f"{self.base_url}/seasons/{self.season}/skills?post_season=0&grade_level=Middle%20School"
         else:
-            url = f"https://www.robotevents.com/api/seasons/{self.season}/skills?post_season=0&grade_level=High%20School"
-
-        res = requests.get(url)
-        try:
-            res.raise_for_status()
-        except requests.RequestException as exc:
-            self.logger.exception("API request failed: %s %s", url, exc)
-            return
+            url = f"{self.base_url}/seasons/{self.season}/skills?post_season=0&grade_level=High%20School"
 
-        res = res.json()
-        updated_count = 0
-        created_count = 0
         start = time.time()
-
-        for team_data in res:
-            print(
-                f"Processing team {team_data['team']['team']} (took {time.time() - start:.2f}s)"
-            )
-            start = time.time()
-
-            tt = team_data["team"]
-            team_id = tt["id"]  # pyright: ignore[reportAny]
-
-            # Check if team already exists in database
-            existing_team = session.get(Teams, team_id)
-
-            if existing_team:
-                # Update existing team's skill scores
-                existing_team.world_rank = team_data["rank"]
-                existing_team.score = team_data["scores"]["score"]
-                existing_team.programming = team_data["scores"]["programming"]
-                existing_team.driver = team_data["scores"]["driver"]
-                updated_count += 1
-                print(f"  Updated existing team: {existing_team.number}")
-            else:
-                # Create new team with all fields
-                country: str = tt["country"]  # pyright: ignore[reportAny, reportAssignmentType]
-                region: str | None = tt["eventRegion"]
-                if not region:
-                    region = country
-
-                new_team = Teams(
-                    id=team_id,
-                    number=tt["team"],  # pyright: ignore[reportAny]
-                    organization=tt["organization"],  # pyright: ignore[reportAny]
-                    country=country,
-                    region=region,
-                    grade=tt["gradeLevel"],  # pyright: ignore[reportAny]
-                    world_rank=team_data["rank"],
-                    score=team_data["scores"]["score"],
-                    programming=team_data["scores"]["programming"],
-                    driver=team_data["scores"]["driver"],
+        with self._skills_payload(url, stream) as chunks:
+            if chunks is None:
+                return
+
+            def team_rows() -> Iterator[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+                records = (
+                    iter_json_array(chunks)
+                    if stream
+                    else json.loads(b"".join(chunks))  # pyright: ignore[reportAny]
                 )
-                session.add(new_team)
-                created_count += 1
-                print(f"  Created new team: {new_team.number}")
-
-            # Commit every 100 teams to avoid keeping too much in memory
-            if (updated_count + created_count) % 100 == 0:
-                session.commit()
-                print(f"  Progress: {updated_count} updated, {created_count} created")
-
-            if (updated_count + created_count) >= 10000:
-                print("10000 team limit reached!")
-                break
-
-        # Final commit for remaining teams
-        session.commit()
+                # the same team can't rank twice, but keep the best rank if it ever does
+                seen: set[int] = set()
+                for team_data in records:  # pyright: ignore[reportAny]
+                    row = self.skills_row(team_data)  # pyright: ignore[reportAny]
+                    if row["id"] not in seen:
+                        seen.add(row["id"])  # pyright: ignore[reportAny]
+                        yield row
+
+            diff = db.upsert_teams(session, team_rows(), chunk_size=chunk_size)
         print(
-            f"\nCompleted: {updated_count} teams updated, {created_count} teams created"
+            f"\nCompleted: {diff.inserted} teams created, {diff.changed} updated, "
+            f"{diff.unchanged} unchanged in {time.time() - start:.2f}s"
         )
-        return updated_count, created_count
+        return diff
+
+    @contextmanager
+    def _skills_payload(
+        self, url: str, stream: bool
+    ) -> Iterator[Iterator[bytes] | None]:
+        """Season skills body as byte chunks (None on failure), via the archive if set."""
+        key = url.removeprefix(self.base_url)
+        if self.archive is not None and self.archive.replaying:
+            raw = self.archive.get_raw(key)
+            if raw is None:
+                self.logger.error("not in archive %s: %s", self.archive.path, key)
+            yield iter((raw,)) if raw is not None else None
+            return
 
-    def get_worlds_teams(self) -> list[int] | None:
-        event = "/events/58909/teams"
+        res = self.http.get(url, stream=stream)
+        with res:
+            try:
+                res.raise_for_status()
+            except requests.RequestException as exc:
+                self.logger.exception("API request failed: %s %s", url, exc)
+                yield None
+                return
+            if self.archive is None:
+                yield res.iter_content(chunk_size=64 * 1024)
+                return
+
+            # recording is a development mode, so holding the payload is fine
+            recorded: list[bytes] = []
+
+            def tee() -> Iterator[bytes]:
+                for chunk in res.iter_content(chunk_size=64 * 1024):
+                    recorded.append(chunk)
+                    yield chunk
+
+            chunks = tee()
+            yield chunks
+            # the parser stops at the closing bracket; keep any trailing bytes
+            for _ in chunks:
+                pass
+            self.archive.put_raw(key, b"".join(recorded))
 
-        res = self.request(event)
-        if not res:
+    def get_worlds_teams(self) -> list[int] | None:
+        try:
+            return [team["id"] for team in self.paginate("/events/58909/teams")]
+        except RuntimeError as exc:
+            self.logger.error("failed to list worlds teams: %s", exc)
             return None
-        pages = res["meta"]["last_page"]
-        print(pages)
-        teams = []
-        for i in range(1, pages + 1):
-            if i >= 2:
-                break
-            res = self.request(event + f"?page={i}")
-            if not res:
-                continue
-            res = res["data"]
-            page = 1
-            print(len(res))
-            for team in res:
-                teams.append(team["id"])
-        return teams
 
     def create_qualifications_full(
         self,
@@ -271,22 +480,30 @@ class RobotEvents:
         resume: bool = True,
         progress_tracker: Optional[ProgressTracker] = None,
         commit_interval: int = 10,
+        workers: int = 1,
     ):
         """
         Create qualifications for all teams with progress tracking and resumption support.
         Periodically commits to database to prevent data loss on interruption.
 
+        Award lookups are fetched on a pool of `workers` threads, but results are
+        consumed in team order on the calling thread, so checkpoints still mark
+        a contiguous prefix of `teams`. Qualifications are buffered and written
+        with one bulk upsert every `commit_interval` teams.
+
         Args:
             session: SQLModel Session object for database operations
             teams: List of team IDs to process
             resume: Whether to resume from last checkpoint (default: True)
-            progress_tracker: Optional ProgressTracker instance (creates new one if None)
-            commit_interval: How often to commit to database (default: every 10 teams)
+            progress_tracker: Optional ProgressTracker instance (creates, and closes, a new one if None)
+            commit_interval: How often to write and commit to database (default: every 10 teams)
+            workers: Number of concurrent award requests (default: 1)
 
         Returns:
             Number of qualifications processed
         """
         # Initialize progress tracker
+        owns_tracker = progress_tracker is None
         if progress_tracker is None:
             progress_tracker = ProgressTracker()
 
@@ -302,38 +519,35 @@ class RobotEvents:
         last_committed_team = None
         last_committed_status = None
 
+        def fetch(team: int) -> Qualification:
+            if worlds_teams and team in worlds_teams:
+                return Qualification.WORLD
+            return self.get_qualifications(team)
+
+        results = prefetch_ordered(fetch, teams[start_index:], workers)
+        pending: list[Qualifications] = []
+
+        write_failed = False
+
+        def flush():
+            nonlocal write_failed
+            try:
+                _ = db.upsert_quals_bulk(session, pending)
+            except Exception:
+                # The buffered rows are lost with the transaction; the
+                # checkpoint stays at the last successful flush
+                write_failed = True
+                session.rollback()
+                raise
+            pending.clear()
+
         try:
-            for i in range(start_index, len(teams)):
+            for i, result in enumerate(results, start=start_index):
                 team = teams[i]
 
                 try:
                     # Determine qualification status
-                    if worlds_teams and team in worlds_teams:
-                        q = Qualification.WORLD
-                    else:
-                        q = self.get_qualifications(team)
-
-                    # Upsert to database immediately
-                    qual_obj = Qualifications(team_id=team, status=q)
-                    db.upsert_quals(session, qual_obj)
-                    processed_count += 1
-
-                    # Update progress tracker for every team
-                    progress_tracker.update_progress(i, team, q.name, force_save=False)
-
-                    # Periodic commit to save progress to database
-                    if processed_count % commit_interval == 0:
-                        session.commit()
-                        # Track what was committed
-                        last_committed_index = i
-                        last_committed_team = team
-                        last_committed_status = q.name
-                        # Save checkpoint after commit
-                        progress_tracker._save_progress()
-                        progress_tracker._log(
-                            f"✓ CHECKPOINT: Database committed at {processed_count} teams"
-                        )
-
+                    q = result.result()
                 except Exception as e:
                     # Log the error but continue processing other teams
                     progress_tracker._log(
@@ -347,9 +561,31 @@ class RobotEvents:
                         exc_info=True,
                     )
                     # Continue to next team rather than stopping entire process
+                    continue
+
+                # Buffered until the next periodic commit
+                pending.append(Qualifications(team_id=team, status=q))
+                processed_count += 1
+
+                # Update progress tracker for every team
+                progress_tracker.update_progress(i, team, q.name, force_save=False)
+
+                # Periodic commit to save progress to database; a database
+                # error here fails the whole run (handled below)
+                if processed_count % commit_interval == 0:
+                    flush()
+                    # Track what was committed
+                    last_committed_index = i
+                    last_committed_team = team
+                    last_committed_status = q.name
+                    # Save checkpoint after commit
+                    progress_tracker._save_progress()
+                    progress_tracker._log(
+                        f"✓ CHECKPOINT: Database committed at {processed_count} teams"
+                    )
 
             # Final commit for any remaining changes
-            session.commit()
+            flush()
             # Update progress tracker with final state
             if len(teams) > 0:
                 last_idx = len(teams) - 1
@@ -361,7 +597,8 @@ class RobotEvents:
             progress_tracker.complete()
 
         except KeyboardInterrupt:
-            session.commit()  # Save progress before exiting
+            if not write_failed:
+                flush()  # Save progress before exiting
             # Update progress tracker to reflect what was just committed
             if last_committed_index >= start_index and last_committed_team is not None:
                 progress_tracker.update_progress(
@@ -375,7 +612,8 @@ class RobotEvents:
             )
             raise
         except Exception as e:
-            session.commit()  # Try to save progress even on error
+            if not write_failed:
+                flush()  # Try to save progress even on error
             # Update progress tracker to reflect what was just committed
             if last_committed_index >= start_index and last_committed_team is not None:
                 progress_tracker.update_progress(
@@ -388,9 +626,182 @@ class RobotEvents:
                 f"ERROR: {e}. Progress committed to database. Run again to resume."
             )
             raise
+        finally:
+            results.close()
+            if owns_tracker:
+                progress_tracker.close()
 
         return processed_count
 
+    def get_season_events(self) -> Iterator[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+        """Stream every event of the current season."""
+        return self.paginate(f"/events?season%5B%5D={self.season}&myEvents=false")
+
+    def get_event_awards(self, event_id: int) -> list[dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+        return list(self.paginate(f"/events/{event_id}/awards", workers=1))
+
+    def get_event_qualifications(self, event_id: int) -> dict[int, Qualification]:
+        """Highest qualification earned by each award winner at one event."""
+        statuses: dict[int, Qualification] = {}
+        for award in self.get_event_awards(event_id):
+            if not award["qualifications"]:
+                continue
+            best = max(Qualification.from_string(q) for q in award["qualifications"])
+            for winner in award["teamWinners"]:
+                team_id: int = winner["team"]["id"]
+                if best > statuses.get(team_id, Qualification.NONE):
+                    statuses[team_id] = best
+        return statuses
+
+    def fold_event_qualifications(
+        self, events: list[int], workers: int
+    ) -> tuple[dict[int, Qualification], int]:
+        """
+        Fetch awards for events concurrently and keep each team's best qualification.
+
+        Returns:
+            (team id -> highest qualification earned, number of events that failed)
+        """
+        statuses: dict[int, Qualification] = {}
+        failed = 0
+        results = prefetch_ordered(self.get_event_qualifications, events, workers)
+        try:
+            for event_id, result in zip(events, results):
+                try:
+                    event_statuses = result.result()
+                except Exception as e:
+                    failed += 1
+                    self.logger.error("skipping event %d: %s", event_id, e)
+                    continue
+                for team_id, q in event_statuses.items():
+                    if q > statuses.get(team_id, Qualification.NONE):
+                        statuses[team_id] = q
+        finally:
+            results.close()
+        return statuses, failed
+
+    def create_qualifications_events(
+        self,
+        session: Session,
+        workers: int = 8,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> int:
+        """
+        Derive qualifications from event awards instead of per-team award lookups.
+
+        Pages through the season's events, fetches the awards of every event with
+        finalized awards on `workers` threads, folds each award's qualifications
+        into a per-team maximum and writes the result with one bulk upsert.
+        Teams without a qualifying award are written as NONE so they still show
+        up on the leaderboard.
+
+        Args:
+            session: SQLModel Session object for database operations
+            workers: Number of concurrent event award requests (default: 8)
+            progress_tracker: Optional ProgressTracker used for logging
+
+        Returns:
+            Number of qualifications written
+        """
+        if progress_tracker is not None:
+            self.progress_tracker = progress_tracker
+        tracker = self.progress_tracker
+
+        events = [e["id"] for e in self.get_season_events() if e["awards_finalized"]]
+        if tracker:
+            tracker._log(f"SCANNING awards for {len(events)} finalized events")
+
+        known = set(db.get_all_teams(session))
+        statuses = {team_id: Qualification.NONE for team_id in known}
+        earned, failed = self.fold_event_qualifications(events, workers)
+        for team_id, q in earned.items():
+            # awards can name teams we have no skills record for
+            if team_id in known and q > statuses[team_id]:
+                statuses[team_id] = q
+
+        written = db.upsert_quals_bulk(
+            session,
+            (Qualifications(team_id=t, status=q) for t, q in statuses.items()),
+        )
+        if tracker:
+            tracker._log(
+                f"COMPLETED event qualification scan: {written} teams written, "
+                f"{failed} of {len(events)} events failed"
+            )
+            if any(tracker.cache_counts.values()):
+                tracker._log(tracker.cache_summary())
+        return written
+
+    def create_qualifications_incremental(
+        self,
+        session: Session,
+        since: datetime,
+        workers: int = 8,
+        lookback: timedelta = timedelta(days=14),
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> int:
+        """
+        Refresh qualifications only for teams with new awards since the last run.
+
+        The API has no "updated since" filter for awards, so this scans events
+        starting after `since - lookback` (the lookback covers events whose
+        awards were finalized days after they began). Only winners from those
+        events are written, teams already at WORLD are skipped since status
+        never goes down, and teams with no qualification row yet (e.g. new
+        from parse_skills) are written as NONE so they show on the leaderboard.
+
+        Args:
+            session: SQLModel Session object for database operations
+            since: Time of the last completed refresh (Metadata.last_slow_update,
+                naive local time, or an aware datetime)
+            workers: Number of concurrent event award requests (default: 8)
+            lookback: Extra window before `since` to rescan (default: 14 days)
+            progress_tracker: Optional ProgressTracker used for logging
+
+        Returns:
+            Number of qualifications written
+        """
+        if progress_tracker is not None:
+            self.progress_tracker = progress_tracker
+        tracker = self.progress_tracker
+
+        # the filter is UTC ("Z"); naive times (Metadata) are local, astimezone converts them
+        start_utc = (since - lookback).astimezone(timezone.utc)
+        start = quote(start_utc.strftime("%Y-%m-%dT%H:%M:%SZ"))
+        events = [
+            e["id"]
+            for e in self.paginate(
+                f"/events?season%5B%5D={self.season}&start={start}&myEvents=false"
+            )
+            if e["awards_finalized"]
+        ]
+        if tracker:
+            tracker._log(
+                f"SCANNING awards for {len(events)} finalized events since {since - lookback:%Y-%m-%d}"
+            )
+
+        earned, failed = self.fold_event_qualifications(events, workers)
+        known = set(db.get_all_teams(session))
+        done = set(db.get_teams_with_status(session, Qualification.WORLD))
+        statuses = {
+            team_id: q
+            for team_id, q in earned.items()
+            if team_id in known and team_id not in done
+        }
+        for team_id in db.get_teams_without_quals(session):
+            _ = statuses.setdefault(team_id, Qualification.NONE)
+
+        written = db.upsert_quals_bulk(
+            session,
+            (Qualifications(team_id=t, status=q) for t, q in statuses.items()),
+        )
+        if tracker:
+            tracker._log(
+                f"COMPLETED incremental qualification refresh: {written} teams written, "
+                f"{len(done)} already at WORLD skipped, {failed} of {len(events)} events failed"
+            )
+        return written
+
     def create_qualifications_worlds(
         self, teams: list[int]
     ) -> list[Qualifications] | None:
@@ -408,31 +819,38 @@ class RobotEvents:
                 return True
         return False
 
-    def create_qualifications_sig(self) -> list[Qualifications] | None:
-        res = self.request(
-            f"/events?season%5B%5D={self.season}&level%5B%5D=Signature&myEvents=false"
-        )
-        if not res:
+    def create_qualifications_sig(self, workers: int = 4) -> list[Qualifications] | None:
+        try:
+            ids = [
+                event["id"]
+                for event in self.paginate(
+                    f"/events?season%5B%5D={self.season}&level%5B%5D=Signature&myEvents=false"
+                )
+                if event["awards_finalized"]
+            ]
+        except RuntimeError as exc:
+            self.logger.error("failed to list signature events: %s", exc)
             return None
-        ids: list[int] = []
         sig_quals = ["Excellence", "Tournament Champions"]
         qualified: list[Qualifications] = []
-        for event in res["data"]:
-            if event["awards_finalized"]:
-                ids.append(event["id"])
-        count = 0
-        for id in ids[14:]:
-            print("checking sig: ", id)
-            res = self.request(f"/events/{id}/awards")
-            if not res:
-                self.logger.exception("failed GET on event id ", id)
-                continue
-            for award in res["data"]:
-                if self.award_contains(award["title"], sig_quals):
-                    for winner in award["teamWinners"]:
-                        qualified.append(
-                            Qualifications(
-                                team_id=winner["team"]["id"], status=Qualification.WORLD
+        results = prefetch_ordered(self.get_event_awards, ids, workers)
+        try:
+            for id, result in zip(ids, results):
+                print("checking sig: ", id)
+                try:
+                    awards = result.result()
+                except RuntimeError:
+                    self.logger.exception("failed GET on event id %d", id)
+                    continue
+                for award in awards:
+                    if self.award_contains(award["title"], sig_quals):
+                        for winner in award["teamWinners"]:
+                            qualified.append(
+                                Qualifications(
+                                    team_id=winner["team"]["id"],
+                                    status=Qualification.WORLD,
+                                )
                             )
-                        )
+        finally:
+            results.close()
         return qualified
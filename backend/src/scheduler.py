@@ -0,0 +1,197 @@
+import itertools
+import logging
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional, Protocol
+
+
+@dataclass
+class JobRun:
+    id: int
+    job: str
+    trigger: str
+    started_at: datetime
+    state: str = "running"  # running | succeeded | failed | skipped
+    finished_at: Optional[datetime] = None
+    processed: int = 0
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        end = self.finished_at or datetime.now()
+        return (end - self.started_at).total_seconds()
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second."""
+        return self.processed / self.duration if self.duration > 0 else 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "id": self.id,
+            "job": self.job,
+            "trigger": self.trigger,
+            "state": self.state,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(self.duration, 3),
+            "processed": self.processed,
+            "per_second": round(self.throughput, 2),
+            "error": self.error,
+        }
+
+
+@dataclass
+class Job:
+    name: str
+    fn: Callable[[], int]
+    interval: Optional[timedelta]
+    next_run: Optional[datetime] = None
+    history: deque[JobRun] = field(default_factory=lambda: deque(maxlen=20))
+    # the run being started or in progress; set under Scheduler._lock, so
+    # runs in this process never overlap
+    current: Optional[JobRun] = None
+
+    @property
+    def last_run(self) -> Optional[JobRun]:
+        return self.history[-1] if self.history else None
+
+
+class Lease(Protocol):
+    """Cross-process exclusion for job runs (db.JobLeases)."""
+
+    def acquire(self, name: str) -> bool: ...
+
+    def release(self, name: str): ...
+
+
+class Scheduler:
+    """
+    Runs ingestion jobs in background threads on a fixed cadence or on demand.
+
+    Each job is single-flight: a trigger while a run is in progress returns
+    the running JobRun instead of starting a second one. With a `lease`, that
+    also holds across processes (e.g. `serve --workers N`): a trigger while
+    another process runs the job returns a "skipped" JobRun.
+    """
+
+    logger: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(self, tick: float = 5.0, lease: Optional[Lease] = None):
+        self.jobs: dict[str, Job] = {}
+        self.tick = tick
+        self.lease = lease
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(
+        self,
+        name: str,
+        fn: Callable[[], int],
+        interval: Optional[timedelta] = None,
+        first_run: Optional[datetime] = None,
+    ):
+        """
+        Register a job. fn returns the number of items it processed.
+
+        Args:
+            name: Job name used by trigger() and the API
+            fn: Callable doing the work
+            interval: Cadence for scheduled runs (None: manual only)
+            first_run: When the first scheduled run is due (default: now + interval)
+        """
+        next_run = first_run
+        if next_run is None and interval is not None:
+            next_run = datetime.now() + interval
+        self.jobs[name] = Job(name, fn, interval, next_run)
+
+    def trigger(self, name: str, trigger: str = "manual") -> tuple[JobRun, bool]:
+        """
+        Start a run of the job in a background thread.
+
+        Returns:
+            (run, started); started is False if a run was already starting or
+            in progress (that run is returned), if another process holds the
+            lease (a skipped run, not kept in the history) or if the lease
+            could not be taken (a failed run)
+
+        Raises:
+            KeyError: if no job has that name
+        """
+        job = self.jobs[name]
+        with self._lock:
+            if job.current is not None:
+                return job.current, False
+            run = job.current = JobRun(next(self._ids), name, trigger, datetime.now())
+            job.history.append(run)
+            if job.interval is not None:
+                job.next_run = datetime.now() + job.interval
+
+        try:
+            leased = self.lease is None or self.lease.acquire(name)
+        except Exception as e:
+            self.logger.error("taking the %s lease failed", name, exc_info=True)
+            self._finish(job, run, "failed", f"lease: {type(e).__name__}: {e}")
+            return run, False
+        if not leased:
+            # another process runs it; not part of this process's history
+            job.history.remove(run)
+            self._finish(job, run, "skipped", "running in another process")
+            return run, False
+
+        thread = threading.Thread(
+            target=self._run, args=(job, run), name=f"job-{name}-{run.id}", daemon=True
+        )
+        thread.start()
+        return run, True
+
+    def _finish(self, job: Job, run: JobRun, state: str, error: Optional[str] = None):
+        run.state = state
+        run.error = error
+        run.finished_at = datetime.now()
+        with self._lock:
+            job.current = None
+
+    def _run(self, job: Job, run: JobRun):
+        state, error = "succeeded", None
+        try:
+            run.processed = job.fn() or 0
+        except Exception as e:
+            state, error = "failed", f"{type(e).__name__}: {e}"
+            self.logger.error("job %s failed", job.name, exc_info=True)
+        finally:
+            if self.lease is not None:
+                try:
+                    self.lease.release(job.name)
+                except Exception:
+                    self.logger.error("releasing the %s lease failed", job.name, exc_info=True)
+            self._finish(job, run, state, error)
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            now = datetime.now()
+            for job in self.jobs.values():
+                if job.next_run is not None and job.next_run <= now:
+                    # a failing trigger must not end the loop; the next tick retries
+                    try:
+                        _ = self.trigger(job.name, trigger="schedule")
+                    except Exception:
+                        self.logger.error("scheduling %s failed", job.name, exc_info=True)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop scheduling new runs; runs already in progress finish on their own."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,307 @@
+"""
+Sharded qualification ingestion across worker processes.
+
+create_qualifications_full in one process is bound by the GIL for JSON
+decoding and ORM work. Here the team ids are split into N shards, each run
+by create_qualifications_full in its own process with its own session,
+request budget share and checkpoint file. The coordinator merges the shard
+checkpoints into one progress/ETA line and records finished shards in a
+manifest, so after a crash only the unfinished shards are run again (each
+resuming from its own checkpoint).
+
+Files (in the working directory, removed once every shard has finished):
+    qualification_shards.json              manifest: team ids per shard, done flags
+    qualification_progress.shard{i}.json   per-shard checkpoint
+    qualification_progress.shard{i}.log    per-shard progress log
+"""
+
+import json
+import multiprocessing
+import os
+import pickle
+import time
+from datetime import datetime
+from multiprocessing.connection import Connection, _ConnectionBase, wait  # pyright: ignore[reportPrivateUsage]
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any, Optional, TypedDict, cast
+
+from sqlmodel import Session
+
+import db
+from progress_tracker import ProgressTracker
+
+MANIFEST = Path("qualification_shards.json")
+
+
+class ShardEntry(TypedDict):
+    teams: list[int]
+    done: bool
+
+
+class Manifest(TypedDict):
+    created: str
+    shard_count: int
+    shards: list[ShardEntry]
+
+
+def shard_progress_file(index: int) -> Path:
+    return Path(f"qualification_progress.shard{index}.json")
+
+
+def shard_log_file(index: int) -> Path:
+    return Path(f"qualification_progress.shard{index}.log")
+
+
+def plan_shards(teams: list[int], shards: int) -> list[list[int]]:
+    """Split team ids into `shards` interleaved slices of similar size."""
+    ordered = sorted(teams)
+    return [ordered[i::shards] for i in range(shards) if ordered[i::shards]]
+
+
+def _load_manifest() -> Optional[Manifest]:
+    """The saved shard plan, or None if there is none or it is not well formed."""
+    try:
+        with open(MANIFEST, "r") as f:
+            loaded = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _is_manifest(loaded):
+        return None
+    return cast(Manifest, loaded)
+
+
+def _is_manifest(loaded: object) -> bool:
+    if not isinstance(loaded, dict):
+        return False
+    shards = loaded.get("shards")
+    return (
+        isinstance(loaded.get("created"), str)
+        and isinstance(shards, list)
+        and loaded.get("shard_count") == len(shards)
+        and all(
+            isinstance(shard, dict)
+            and isinstance(shard.get("teams"), list)
+            and isinstance(shard.get("done"), bool)
+            for shard in shards
+        )
+    )
+
+
+def _save_manifest(manifest: Manifest):
+    tmp = MANIFEST.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, MANIFEST)
+
+
+def _shard_processed(index: int, manifest: Manifest) -> int:
+    """Teams a shard has checkpointed so far (all of them once it is done)."""
+    shard = manifest["shards"][index]
+    if shard["done"]:
+        return len(shard["teams"])
+    try:
+        with open(shard_progress_file(index), "r") as f:
+            return json.load(f).get("processed_count", 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def run_shard(
+    index: int,
+    teams: list[int],
+    token: str,
+    processes: int,
+    workers: int,
+    commit_interval: int,
+    base_url: Optional[str],
+    conn: Connection,
+):
+    """Shard process body: one create_qualifications_full run; sends back its count or error."""
+    import ingest
+
+    tracker = ProgressTracker(
+        log_file=str(shard_log_file(index)),
+        progress_file=str(shard_progress_file(index)),
+        quiet=True,
+        json_lines=os.environ.get("PROGRESS_JSON") == "1",
+    )
+    try:
+        robotevents = ingest.make_robotevents(
+            token, tracker, processes=processes, base_url=base_url
+        )
+        with Session(db.get_engine()) as session:
+            conn.send(
+                robotevents.create_qualifications_full(
+                    session=session,
+                    teams=teams,
+                    resume=True,
+                    progress_tracker=tracker,
+                    commit_interval=commit_interval,
+                    workers=workers,
+                )
+            )
+    except Exception as e:
+        # The checkpoint is already saved; report why so the coordinator can log it
+        conn.send(e if _picklable(e) else RuntimeError(f"{type(e).__name__}: {e}"))
+        raise SystemExit(1)
+    finally:
+        tracker.close()
+        conn.close()
+
+
+def _picklable(e: Exception) -> bool:
+    try:
+        _ = pickle.loads(pickle.dumps(e))
+        return True
+    except Exception:
+        return False
+
+
+def create_qualifications_sharded(
+    session: Session,
+    token: str,
+    shards: int,
+    workers: int = 8,
+    commit_interval: int = 100,
+    progress_tracker: Optional[ProgressTracker] = None,
+    base_url: Optional[str] = None,
+    poll_interval: float = 5.0,
+) -> int:
+    """
+    Run create_qualifications_full over `shards` processes and merge their progress.
+
+    An existing manifest means a previous run was interrupted: its shard plan
+    is reused (so shard checkpoints stay valid) and only unfinished shards are
+    started. Otherwise team ids come from db.get_all_teams. The RobotEvents
+    request budget (ROBOTEVENTS_RATE / _BURST) is divided between the shards.
+    A shard that fails or dies leaves the others running; the call then raises
+    once they are done, and the next call picks up just the failed shards.
+
+    Args:
+        session: Session used to list teams for a new plan
+        token: RobotEvents API token
+        shards: Number of worker processes
+        workers: Concurrent award requests per shard
+        commit_interval: Teams per bulk upsert + checkpoint in each shard
+        progress_tracker: Optional ProgressTracker for the merged progress log
+        base_url: RobotEvents base URL override (e.g. a local stand-in)
+        poll_interval: Seconds between merged progress lines
+
+    Returns:
+        Number of qualifications processed by this call
+    """
+    manifest = _load_manifest()
+    if manifest is None:
+        plan = plan_shards(db.get_all_teams(session), shards)
+        manifest = Manifest(
+            created=datetime.now().isoformat(),
+            shard_count=len(plan),
+            shards=[ShardEntry(teams=teams, done=False) for teams in plan],
+        )
+        _save_manifest(manifest)
+        for i in range(len(plan)):
+            shard_progress_file(i).unlink(missing_ok=True)
+    shard_count = manifest["shard_count"]
+    pending = [i for i, shard in enumerate(manifest["shards"]) if not shard["done"]]
+    total = sum(len(shard["teams"]) for shard in manifest["shards"])
+
+    def log(message: str, **fields: Any):  # pyright: ignore[reportExplicitAny]
+        if progress_tracker is not None:
+            progress_tracker._log(message, **fields)
+        else:
+            print(message)
+
+    log(
+        f"SHARDED run: {len(pending)} of {shard_count} shards to go, "
+        f"{total} teams, {workers} requests in flight per shard"
+    )
+
+    start = time.monotonic()
+    seen = [_shard_processed(i, manifest) for i in range(shard_count)]
+    already = sum(seen)
+    processed = 0
+    failed: list[int] = []
+
+    ctx = multiprocessing.get_context("spawn")
+    # Connection on POSIX, PipeConnection on Windows
+    running: dict[int, tuple[BaseProcess, _ConnectionBase[Any, Any]]] = {}  # pyright: ignore[reportExplicitAny]
+    try:
+        for i in pending:
+            parent, child = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=run_shard,
+                args=(
+                    i,
+                    manifest["shards"][i]["teams"],
+                    token,
+                    len(pending),
+                    workers,
+                    commit_interval,
+                    base_url,
+                    child,
+                ),
+                name=f"qualification-shard-{i}",
+            )
+            process.start()
+            child.close()
+            running[i] = (process, parent)
+
+        while running:
+            _ = wait([p.sentinel for p, _ in running.values()], timeout=poll_interval)
+            for i, (process, conn) in list(running.items()):
+                if process.is_alive():
+                    continue
+                del running[i]
+                try:
+                    result = conn.recv() if conn.poll() else None
+                except EOFError:  # died without reporting
+                    result = None
+                conn.close()
+                if isinstance(result, int) and process.exitcode == 0:
+                    processed += result
+                    manifest["shards"][i]["done"] = True
+                    _save_manifest(manifest)
+                else:
+                    failed.append(i)
+                    reason = result or f"exit code {process.exitcode}"
+                    log(f"ERROR: shard {i} failed ({reason}); its checkpoint is kept")
+
+            # A finishing shard deletes its checkpoint before it is marked done
+            for i in range(shard_count):
+                seen[i] = max(seen[i], _shard_processed(i, manifest))
+            merged = sum(seen)
+            elapsed = time.monotonic() - start
+            rate = (merged - already) / elapsed if elapsed > 0 else 0
+            eta = (total - merged) / rate if rate > 0 else 0
+            log(
+                f"[{merged}/{total}] shards done: "
+                f"{sum(s['done'] for s in manifest['shards'])}/{shard_count} | "
+                f"Progress: {merged / total * 100 if total else 100:.1f}% | "
+                f"{rate:.1f} teams/s | ETA: {eta / 60:.1f}m",
+                processed=merged,
+                total=total,
+                teams_per_second=round(rate, 2),
+                eta_seconds=round(eta),
+            )
+    finally:
+        # Interrupted: shards got the same SIGINT and save their checkpoints
+        for process, conn in running.values():
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+
+    if failed:
+        raise RuntimeError(
+            f"shards {sorted(failed)} failed; run again to resume them from their checkpoints"
+        )
+
+    for i in range(shard_count):
+        shard_progress_file(i).unlink(missing_ok=True)
+    MANIFEST.unlink(missing_ok=True)
+    log(
+        f"COMPLETED sharded qualification creation: {processed} teams "
+        f"in {time.monotonic() - start:.0f}s"
+    )
+    return processed
@@ -0,0 +1,172 @@
+"""
+Opt-in SQL profiler (SQL_PROFILE=1) with N+1 detection.
+
+Once installed on an engine, every statement run inside a `profile()` block
+is recorded with its duration and the application call path that issued it.
+Statements are aggregated by shape (whitespace collapsed, bind lists and
+repeated VALUES tuples folded), and a call path that issues the same shape
+more than `threshold` times is flagged as a likely N+1. The block prints a
+ranked report when it exits.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+SRC = os.path.dirname(os.path.abspath(__file__))
+
+_WHITESPACE = re.compile(r"\s+")
+_BIND = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_BIND_LIST = re.compile(rf"\(\s*{_BIND}(?:\s*,\s*{_BIND})*\s*\)")
+_REPEATED_TUPLES = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in bind count compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _BIND_LIST.sub("(...)", shape)
+    return _REPEATED_TUPLES.sub(r"\1, ...", shape)
+
+
+def call_path(depth: int = 3) -> str:
+    """The innermost `depth` application frames, skipping library code."""
+    frames: list[str] = []
+    frame = sys._getframe(1)  # pyright: ignore[reportPrivateUsage]
+    while frame is not None and len(frames) < depth:
+        filename = frame.f_code.co_filename
+        if filename.startswith(SRC) and filename != __file__:
+            frames.append(
+                f"{os.path.relpath(filename, SRC)}:{frame.f_lineno} {frame.f_code.co_name}"
+            )
+        frame = frame.f_back
+    return " < ".join(frames) or "<unknown>"
+
+
+@dataclass
+class ShapeStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    paths: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass
+class Profile:
+    """Statements recorded during one profile() block."""
+
+    name: str
+    threshold: int
+    shapes: dict[str, ShapeStats] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, statement: str, duration: float, path: str):
+        shape = statement_shape(statement)
+        with self._lock:
+            stats = self.shapes.get(shape)
+            if stats is None:
+                stats = self.shapes[shape] = ShapeStats()
+            stats.count += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            stats.paths[path] += 1
+
+    @property
+    def statements(self) -> int:
+        return sum(s.count for s in self.shapes.values())
+
+    def n_plus_one(self) -> list[tuple[str, str, int]]:
+        """(call path, shape, count) for every path over the threshold, worst first."""
+        flagged = [
+            (path, shape, n)
+            for shape, stats in self.shapes.items()
+            for path, n in stats.paths.items()
+            if n > self.threshold
+        ]
+        return sorted(flagged, key=lambda f: -f[2])
+
+    def report(self, top: int = 15, width: int = 100) -> str:
+        elapsed = time.perf_counter() - self.started
+        total = sum(s.total for s in self.shapes.values())
+        lines = [
+            f"SQL profile [{self.name}]: {self.statements} statements, "
+            f"{len(self.shapes)} shapes, {total * 1000:.1f} ms in the database "
+            f"of {elapsed * 1000:.1f} ms"
+        ]
+        ranked = sorted(self.shapes.items(), key=lambda item: -item[1].total)
+        if ranked:
+            lines.append(f"  {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}  shape")
+        for shape, stats in ranked[:top]:
+            lines.append(
+                f"  {stats.count:>7} {stats.total * 1000:>10.2f} "
+                f"{stats.total / stats.count * 1000:>9.3f} {stats.max * 1000:>9.3f}  "
+                f"{shape[:width]}"
+            )
+            path, n = stats.paths.most_common(1)[0]
+            lines.append(f"  {'':>39}  from {path} ({n}x)")
+        for path, shape, n in self.n_plus_one():
+            lines.append(f"  N+1? {n}x from {path}: {shape[:width]}")
+        return "\n".join(lines)
+
+
+_current: ContextVar[Profile | None] = ContextVar("sql_profile", default=None)
+enabled = False
+threshold = int(os.environ.get("SQL_PROFILE_N_PLUS_ONE", "20"))
+
+
+def install(engine: Engine):
+    """Record statements run on engine into the active profile()."""
+    global enabled
+    enabled = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn: Any, cursor: Any, statement: str, *_: Any):  # pyright: ignore[reportExplicitAny, reportUnusedFunction]
+        if _current.get() is not None:
+            conn.info.setdefault("profile_start", []).append(
+                (time.perf_counter(), call_path())
+            )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn: Any, cursor: Any, statement: str, *_: Any):  # pyright: ignore[reportExplicitAny, reportUnusedFunction]
+        profile = _current.get()
+        pending = conn.info.get("profile_start")
+        if profile is None or not pending:
+            return
+        started, path = pending.pop()
+        profile.record(statement, time.perf_counter() - started, path)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context: Any):  # pyright: ignore[reportExplicitAny, reportUnusedFunction]
+        conn = context.connection
+        if conn is not None and conn.info.get("profile_start"):
+            _ = conn.info["profile_start"].pop()
+
+
+@contextmanager
+def profile(name: str, top: int = 15) -> Iterator[Profile | None]:
+    """
+    Profile the statements issued inside the block and print a report on exit.
+
+    Does nothing (yields None) unless install() has been called.
+    """
+    if not enabled:
+        yield None
+        return
+    current = Profile(name, threshold)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+        if current.statements:
+            print(current.report(top=top))
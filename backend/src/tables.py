@@ -5,6 +5,7 @@ from sqlmodel import (
     DateTime,
     Field,
     ForeignKey,
+    Index,
     Integer,
     Relationship,
     SQLModel,
@@ -32,7 +33,18 @@ class Metadata(SQLModel, table=True):
     last_slow_update: datetime = datetime.now()
 
 
+class DataVersion(SQLModel, table=True):
+    """One row, bumped in the same transaction as every write the API reads."""
+
+    __tablename__ = "data_version"  # pyright: ignore[reportAssignmentType]
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = 0
+
+
 class Qualifications(SQLModel, table=True):
+    __table_args__ = (Index("ix_qualifications_status", "status"),)
+
     team_id: int = Field(
         sa_column=Column(
             Integer,
@@ -45,6 +57,14 @@ class Qualifications(SQLModel, table=True):
 
 
 class Teams(SQLModel, table=True):
+    # Existing databases get these through migrations.py
+    __table_args__ = (
+        Index("ix_teams_grade_region_rank", "grade", "region", "world_rank"),
+        Index("ix_teams_grade_rank", "grade", "world_rank"),
+        Index("ix_teams_region", "region"),
+        Index("ux_teams_number", "number", unique=True),
+    )
+
     id: int = Field(primary_key=True)
     number: str
     organization: str
@@ -59,6 +79,58 @@ class Teams(SQLModel, table=True):
     qualification_status: Qualifications = Relationship(back_populates="team")
 
 
+class RegionStats(SQLModel, table=True):
+    """Per (grade, region) aggregates for GET /stats, kept current by db's write paths."""
+
+    __tablename__ = "region_stats"  # pyright: ignore[reportAssignmentType]
+
+    grade: str = Field(primary_key=True)
+    region: str = Field(primary_key=True)
+    country: str
+    teams: int = 0
+    # teams at each level above NONE (the rest are NONE or have no row yet)
+    regional: int = 0
+    world: int = 0
+    score_total: int = 0
+    top_score: int = 0
+    top_score_team: str | None = None
+    top_driver: int = 0
+    top_driver_team: str | None = None
+    top_programming: int = 0
+    top_programming_team: str | None = None
+
+
+class RegionScoreBucket(SQLModel, table=True):
+    """Histogram of team scores per (grade, region), for /stats percentiles."""
+
+    __tablename__ = "region_score_buckets"  # pyright: ignore[reportAssignmentType]
+
+    grade: str = Field(primary_key=True)
+    region: str = Field(primary_key=True)
+    # score // region_stats.SCORE_BUCKET_WIDTH, capped at SCORE_BUCKETS - 1
+    bucket: int = Field(primary_key=True)
+    teams: int = 0
+
+
+class JobLease(SQLModel, table=True):
+    """Which process may run a scheduler job, until expires_at unless renewed."""
+
+    __tablename__ = "job_leases"  # pyright: ignore[reportAssignmentType]
+
+    name: str = Field(primary_key=True)
+    holder: str
+    # naive UTC
+    expires_at: datetime
+
+
+class SchemaMigration(SQLModel, table=True):
+    __tablename__ = "schema_migrations"  # pyright: ignore[reportAssignmentType]
+
+    id: str = Field(primary_key=True)
+    description: str
+    applied_at: datetime = Field(default_factory=datetime.now)
+
+
 class User(SQLModel, table=True):
     id: str = Field(primary_key=True)
     name: str
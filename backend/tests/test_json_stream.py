@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from json_stream import iter_json_array
+
+DOCUMENTS = [
+    "[]",
+    " [ ] ",
+    "[1, -2, 3.5, -0.25, 1e3, 12345678901234567890, true, false, null]",
+    '["plain", "", "quote \\" backslash \\\\ slash \\/", "\\b\\f\\n\\r\\t"]',
+    '["\\u00e9\\u4e2d", "\\ud83d\\ude00 surrogate pair", "raw é 中 😀"]',
+    '[[], {}, [[1, [2, [3]]]], {"a": {"b": [{"c": null}]}}]',
+    '[{"team": {"id": 1, "number": "1A"}, "scores": {"score": 120, "driver": 70}}]',
+    '\n[\n  {"id": 1},\n  {"id": 2}\n]\n',
+]
+
+NOT_ARRAYS = ["{}", '"not an array"', "1", "null"]
+
+MALFORMED = [
+    "",
+    "   ",
+    "[",
+    "[1",
+    "[1,",
+    "[1,]",
+    "[,1]",
+    "[1 2]",
+    '["unterminated]',
+    "[tru]",
+    '[{"a": 1]',
+    "[1]]",
+    "[1] 2",
+]
+
+
+def parse(chunks: list[bytes]) -> list[object]:
+    return list(iter_json_array(chunks))
+
+
+def splits(data: bytes):
+    """Every way of cutting data in two, including inside multibyte characters."""
+    for i in range(len(data) + 1):
+        yield [data[:i], data[i:]]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_single_chunk_matches_json_loads(document: str):
+    assert parse([document.encode()]) == json.loads(document)
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_split_point_matches_json_loads(document: str):
+    data = document.encode()
+    expected = json.loads(document)
+    for chunks in splits(data):
+        assert parse(chunks) == expected, chunks
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_one_byte_chunks_match_json_loads(document: str):
+    data = document.encode()
+    assert parse([data[i : i + 1] for i in range(len(data))]) == json.loads(document)
+
+
+def test_numbers_cut_at_a_chunk_boundary_are_not_truncated():
+    assert parse([b"[1", b"2, -", b"1", b".5e", b"2]"]) == [12, -150.0]
+
+
+def test_empty_chunks_are_skipped():
+    assert parse([b"", b"[", b"", b"1", b"", b"]", b""]) == [1]
+
+
+def test_elements_are_yielded_before_the_array_ends():
+    def chunks():
+        yield b'[{"id": 1}, '
+        raise AssertionError("read past the first element")
+
+    assert next(iter_json_array(chunks())) == {"id": 1}
+
+
+def test_other_encodings():
+    document = '["é", "中"]'
+    assert list(iter_json_array([document.encode("utf-16")], encoding="utf-16")) == [
+        "é",
+        "中",
+    ]
+
+
+@pytest.mark.parametrize("document", NOT_ARRAYS)
+def test_other_top_level_values_raise_value_error(document: str):
+    with pytest.raises(ValueError):
+        _ = parse([document.encode()])
+
+
+@pytest.mark.parametrize("document", MALFORMED)
+def test_malformed_input_raises_value_error(document: str):
+    with pytest.raises(ValueError):
+        _ = json.loads(document)
+    with pytest.raises(ValueError):
+        _ = parse([document.encode()])
+    data = document.encode()
+    with pytest.raises(ValueError):
+        _ = parse([data[i : i + 1] for i in range(len(data))])
+
+
+def test_invalid_utf8_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = parse([b'["\xff"]'])